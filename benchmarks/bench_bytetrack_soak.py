@@ -0,0 +1,77 @@
+"""
+Long-run soak test for BYTETracker memory and per-frame cost.
+
+Feeds synthetic detections of objects that keep appearing, moving and
+disappearing, so tracks are continuously created, lost and removed. Every
+report interval prints the mean update time, traced Python memory and the
+size of the tracker's bookkeeping. Both should stay flat over the run.
+
+Usage: python benchmarks/bench_bytetrack_soak.py [--frames 1000000] [--objects 20] [--report 100000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.detection.bytetracker.byte_tracker import BYTETracker
+
+
+class Scene:
+    """Objects with constant velocity and a random lifetime, respawned when they expire."""
+
+    def __init__(self, rng, objects, size=(1280, 720)):
+        self.rng = rng
+        self.size = np.array(size, dtype=np.float64)
+        self.pos = rng.uniform(0, 1, (objects, 2)) * self.size
+        self.vel = rng.normal(0, 3, (objects, 2))
+        self.wh = rng.uniform(30, 120, (objects, 2))
+        self.life = rng.integers(30, 600, objects)
+
+    def step(self):
+        self.pos += self.vel
+        self.life -= 1
+        respawn = (self.life <= 0) | np.any((self.pos < 0) | (self.pos > self.size), axis=1)
+        n = int(respawn.sum())
+        if n:
+            self.pos[respawn] = self.rng.uniform(0, 1, (n, 2)) * self.size
+            self.vel[respawn] = self.rng.normal(0, 3, (n, 2))
+            self.life[respawn] = self.rng.integers(30, 600, n)
+        # Random misses so tracks also go through the lost state
+        visible = self.rng.uniform(0, 1, len(self.pos)) > 0.05
+        boxes = np.hstack([self.pos, self.pos + self.wh])[visible]
+        scores = self.rng.uniform(0.3, 0.95, (len(boxes), 1))
+        return np.hstack([boxes, scores])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=1_000_000)
+    parser.add_argument("--objects", type=int, default=20)
+    parser.add_argument("--report", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    scene = Scene(rng, args.objects)
+    tracker = BYTETracker(SimpleNamespace(track_thresh=0.5, track_buffer=30, match_thresh=0.8, mot20=False))
+
+    tracemalloc.start()
+    busy = 0.0
+    for frame in range(1, args.frames + 1):
+        dets = scene.step()
+        start = time.perf_counter()
+        tracker.update(dets)
+        busy += time.perf_counter() - start
+
+        if frame % args.report == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            print(f"frame {frame:8d}  {busy / args.report * 1000:6.3f} ms/frame  "
+                  f"mem {current / 1e6:7.2f} MB  tracked {len(tracker.tracked_stracks):3d}  "
+                  f"lost {len(tracker.lost_stracks):3d}  removed ids {len(tracker.removed_track_ids):4d}  "
+                  f"store rows {len(tracker.store):3d}/{tracker.store.capacity}")
+            busy = 0.0
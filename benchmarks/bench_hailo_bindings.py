@@ -0,0 +1,57 @@
+"""
+Compare per-frame binding allocation against the preallocated binding pool.
+
+Runs the same number of inferences through HailoInfer with
+reuse_bindings=False and reuse_bindings=True and prints allocation counts,
+wall time per frame and average NPU latency.
+
+Usage: python benchmarks/bench_hailo_bindings.py [--model models/yolov10s.hef] [--frames 300]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.detection.hailo_inference import HailoInfer
+
+
+def run(model, frames, reuse):
+    infer = HailoInfer(model, pool_size=2, reuse_bindings=reuse)
+    h, w, c = infer.get_input_shape()
+    frame = np.random.randint(0, 255, (h, w, c), dtype=np.uint8)
+
+    done = threading.Semaphore(0)
+
+    def callback(completion_info, bindings_list):
+        done.release()
+
+    allocations_before = infer.buffer_allocations
+    bindings_before = infer.bindings_created
+    start = time.perf_counter()
+    for _ in range(frames):
+        infer.run([frame], callback)
+        done.acquire()
+    elapsed = time.perf_counter() - start
+
+    stats = infer.get_stats()
+    infer.close()
+    print(f"reuse_bindings={reuse}")
+    print(f"  buffer allocations: {stats['buffer_allocations'] - allocations_before}")
+    print(f"  bindings created:   {stats['bindings_created'] - bindings_before}")
+    print(f"  wall time / frame:  {elapsed / frames * 1000:.2f} ms")
+    print(f"  npu latency (avg):  {stats['latency_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="models/yolov10s.hef")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    run(args.model, args.frames, reuse=False)
+    run(args.model, args.frames, reuse=True)
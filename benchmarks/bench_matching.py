@@ -0,0 +1,59 @@
+"""
+Compare cv2.matchTemplate against the FFT correlation engine.
+
+Matches the three NanoTracker scales (0.9, 1.0, 1.1) inside a search window
+of 2 * search_window_scale times the box size, for a range of box sizes,
+and prints time per update for both engines and the largest score
+difference between them. Use it to pick tracking.fft_min_area.
+
+Usage: python benchmarks/bench_matching.py [--sizes 24 32 48 64 96 128 192] [--iters 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.detection.correlation import FFTMatcher, match_spatial
+
+
+def bench(fn, iters):
+    fn()  # Warm up caches (DFT sizes, template spectra)
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return (time.perf_counter() - start) / iters * 1000
+
+
+def run(size, iters, window_scale=2.5):
+    rng = np.random.default_rng(size)
+    window = int(2 * size * window_scale)
+    image = cv2.GaussianBlur(rng.integers(0, 255, (window, window), dtype=np.uint8), (5, 5), 0)
+    base = image[window // 3:window // 3 + size, window // 3:window // 3 + size].copy()
+    templates = {s: cv2.resize(base, (int(size * s), int(size * s))) for s in (0.9, 1.0, 1.1)}
+
+    matcher = FFTMatcher()
+    spatial_ms = bench(lambda: match_spatial(image, templates), iters)
+    fft_ms = bench(lambda: matcher.match(image, templates), iters)
+
+    expected = match_spatial(image, templates)
+    actual = matcher.match(image, templates)
+    error = max(float(np.abs(expected[s] - actual[s]).max()) for s in expected)
+
+    print(f"box {size:4d}px  area {size * size:6d}  window {window:4d}px  "
+          f"spatial {spatial_ms:7.2f} ms  fft {fft_ms:7.2f} ms  "
+          f"speedup {spatial_ms / fft_ms:5.2f}x  max diff {error:.1e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[24, 32, 48, 64, 96, 128, 192])
+    parser.add_argument("--iters", type=int, default=50)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.iters)
@@ -0,0 +1,108 @@
+"""
+Load test for the MJPEG web stream against control endpoint latency.
+
+Attaches N viewers to the stream endpoint of a running API server (some of
+them reading slowly), then times requests to a control endpoint while the
+viewers are connected. Prints control latency percentiles with and without
+viewers, and the frame rate each viewer received. Control latency should
+stay in the low milliseconds with dozens of viewers attached.
+
+Usage: python benchmarks/bench_stream_load.py [--url http://127.0.0.1:8000] [--viewers 30] [--slow 5] [--duration 20]
+"""
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class Viewer(threading.Thread):
+    """Reads the MJPEG stream and counts parts, optionally pausing between reads."""
+
+    def __init__(self, host, port, path, stop, delay=0.0):
+        super().__init__(daemon=True)
+        self.host, self.port, self.path = host, port, path
+        self.stop = stop
+        self.delay = delay
+        self.parts = 0
+        self.error = None
+
+    def run(self):
+        try:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+            conn.request("GET", self.path)
+            response = conn.getresponse()
+            tail = b""
+            while not self.stop.is_set():
+                chunk = response.read1(65536)
+                if not chunk:
+                    break
+                data = tail + chunk
+                self.parts += data.count(b"--frame\r\n")
+                tail = data[-8:]
+                if self.delay:
+                    time.sleep(self.delay)
+            conn.close()
+        except Exception as e:
+            self.error = e
+
+
+def probe(host, port, method, path, duration):
+    """Control endpoint round-trip times in ms over duration seconds."""
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    times = []
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        start = time.perf_counter()
+        conn.request(method, path, body=b"" if method == "POST" else None)
+        conn.getresponse().read()
+        times.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.02)
+    conn.close()
+    return times
+
+
+def report(name, times):
+    times = sorted(times)
+    pct = lambda p: times[min(len(times) - 1, int(len(times) * p))]
+    print(f"{name:16s} n={len(times):5d}  p50 {pct(0.5):6.2f} ms  p95 {pct(0.95):6.2f} ms  "
+          f"p99 {pct(0.99):6.2f} ms  max {times[-1]:7.2f} ms  mean {statistics.mean(times):6.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--stream", default="/video1")
+    parser.add_argument("--control", default="GET /track_status", help="Method and path of the timed endpoint")
+    parser.add_argument("--viewers", type=int, default=30)
+    parser.add_argument("--slow", type=int, default=5, help="Viewers that pause 100 ms between reads")
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+
+    url = urlparse(args.url)
+    host, port = url.hostname, url.port or 80
+    method, path = args.control.split(" ", 1)
+
+    report("idle", probe(host, port, method, path, min(args.duration, 5.0)))
+
+    stop = threading.Event()
+    viewers = [
+        Viewer(host, port, args.stream, stop, delay=0.1 if i < args.slow else 0.0)
+        for i in range(args.viewers)
+    ]
+    started = time.monotonic()
+    for viewer in viewers:
+        viewer.start()
+    time.sleep(1.0)  # Let the viewers connect
+
+    report(f"{args.viewers} viewers", probe(host, port, method, path, args.duration))
+    elapsed = time.monotonic() - started
+    stop.set()
+
+    rates = [v.parts / elapsed for v in viewers if v.error is None]
+    errors = [v.error for v in viewers if v.error is not None]
+    if rates:
+        print(f"viewer fps       min {min(rates):5.1f}  mean {statistics.mean(rates):5.1f}  max {max(rates):5.1f}")
+    if errors:
+        print(f"{len(errors)} viewers failed, first error: {errors[0]}")
@@ -0,0 +1,86 @@
+"""
+Compare per-frame latency of the template NanoTracker (NANO) and the
+Siamese ONNX NanoTrack (NANO_ONNX).
+
+Both trackers follow the same target through a video, or through a
+synthetic clip of a textured patch moving over a noisy background when no
+video is given. Prints mean / p95 update time and how many frames each
+tracker kept the target.
+
+Usage: python benchmarks/bench_trackers.py [--video clip.mp4 --bbox x y w h] [--frames 300]
+                                           [--backend opencv|onnxruntime] [--threads 2]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.detection.tracker import HybridTracker
+from src.detection.nanotrack_onnx import OnnxNanoTracker, load_models
+
+
+def synthetic_clip(frames, size=(720, 1280), box=96):
+    rng = np.random.default_rng(0)
+    background = cv2.GaussianBlur(rng.integers(0, 255, size + (3,), dtype=np.uint8), (9, 9), 0)
+    patch = cv2.GaussianBlur(rng.integers(0, 255, (box, box, 3), dtype=np.uint8), (3, 3), 0)
+    h, w = size
+    clip = []
+    for i in range(frames):
+        x = int((w - box) / 2 + (w - box) / 3 * np.sin(i / 40))
+        y = int((h - box) / 2 + (h - box) / 3 * np.cos(i / 55))
+        frame = background.copy()
+        frame[y:y + box, x:x + box] = patch
+        clip.append(frame)
+    return clip, (int((w - box) / 2), int((h - box) / 2 + (h - box) / 3), box, box)
+
+
+def video_clip(path, frames):
+    cap = cv2.VideoCapture(path)
+    clip = []
+    while len(clip) < frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        clip.append(frame)
+    cap.release()
+    return clip
+
+
+def run(name, make_tracker, clip, bbox):
+    tracker = make_tracker(clip[0], bbox)
+    times = []
+    held = 0
+    for frame in clip[1:]:
+        start = time.perf_counter()
+        _, status, _ = tracker.update(frame)
+        times.append((time.perf_counter() - start) * 1000)
+        held += status in ("LOCK", "TRACK", "RECOV")
+    times = np.array(times)
+    print(f"{name:10s} mean {times.mean():6.2f} ms  p95 {np.percentile(times, 95):6.2f} ms  "
+          f"held {held}/{len(clip) - 1} frames")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video")
+    parser.add_argument("--bbox", type=int, nargs=4, metavar=("X", "Y", "W", "H"))
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--backend", default="opencv")
+    parser.add_argument("--threads", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.video:
+        if not args.bbox:
+            parser.error("--bbox is required with --video")
+        clip, bbox = video_clip(args.video, args.frames), tuple(args.bbox)
+    else:
+        clip, bbox = synthetic_clip(args.frames)
+
+    models = load_models({"backend": args.backend, "threads": args.threads})
+    run("NANO", HybridTracker, clip, bbox)
+    run("NANO_ONNX", lambda frame, box: OnnxNanoTracker(frame, box, models), clip, bbox)
@@ -6,6 +6,7 @@ import cv2
 import time
 import io
 from pydantic import BaseModel
+from src.api.streaming import MjpegBroadcaster, MEDIA_TYPE
 from src.core.app import TrackingApp
 from src.core.config import cfg
 from src.utils.logger import get_logger
@@ -23,6 +24,7 @@ app.add_middleware(
 )
 
 tracker_app = None
+broadcaster = None  # Shared MJPEG encoder for all web stream viewers
 
 # -----------------------
 # Data Models
@@ -50,21 +52,30 @@ class HoldPoint(BaseModel):
 class TrackStatus(BaseModel):
     trackingStatus: bool
 
+class TrackerEngine(BaseModel):
+    tracker_type: str
+
 # -----------------------
 # Lifecycle
 # -----------------------
 @app.on_event("startup")
 async def startup_event():
-    global tracker_app
+    global tracker_app, broadcaster
     logger.info("Starting Tracker App in background...")
     # Force headless in API mode
     cfg._config['system']['headless'] = True
     tracker_app = TrackingApp(mode="production")
     tracker_app.start_threaded()
+    broadcaster = MjpegBroadcaster(tracker_app.output_frames, quality=cfg.get("stream.jpeg_quality", 95))
+    broadcaster.start()
+    # Overlays are only rendered while someone watches
+    tracker_app.add_output_consumer(lambda: broadcaster.active)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     global tracker_app
+    if broadcaster:
+        broadcaster.stop()
     if tracker_app:
         tracker_app.cleanup()
 
@@ -87,24 +98,26 @@ def track_point(data: TrackPoint):
     stream_h = cfg.get("camera.height", 720)
     
     # Check if we can get actual dimensions from camera
-    if hasattr(tracker_app, 'camera') and tracker_app.camera.frame is not None:
-        stream_h, stream_w = tracker_app.camera.frame.shape[:2]
+    if hasattr(tracker_app, 'camera') and tracker_app.camera.frame_shape is not None:
+        stream_h, stream_w = tracker_app.camera.frame_shape[:2]
 
     x = int(data.x_norm * stream_w)
     y = int(data.y_norm * stream_h)
 
     # Check for click on detected object
     selected_bbox = None
+    selected_label = None
     if hasattr(tracker_app, 'latest_detections'):
         for label, conf, det_bbox in tracker_app.latest_detections:
             dx, dy, dw, dh = [int(v) for v in det_bbox]
             if dx <= x <= dx + dw and dy <= y <= dy + dh:
                 logger.info(f"🎯 API Click selected object: {label} ({conf:.2f})")
                 selected_bbox = (dx, dy, dw, dh)
+                selected_label = label
                 break
     
     if selected_bbox:
-        tracker_app.set_tracking_target(selected_bbox)
+        tracker_app.set_tracking_target(selected_bbox, label=selected_label)
     else:
         # Strict mode: Do not track if no object is clicked
         logger.warning(f"📍 API Click at ({x}, {y}) did not hit any of {len(tracker_app.latest_detections) if hasattr(tracker_app, 'latest_detections') else 0} objects. Tracking NOT started.")
@@ -123,8 +136,8 @@ def drag_point(data: DragPoint):
     stream_w = cfg.get("camera.width", 1280)
     stream_h = cfg.get("camera.height", 720)
     
-    if hasattr(tracker_app, 'camera') and tracker_app.camera.frame is not None:
-        stream_h, stream_w = tracker_app.camera.frame.shape[:2]
+    if hasattr(tracker_app, 'camera') and tracker_app.camera.frame_shape is not None:
+        stream_h, stream_w = tracker_app.camera.frame_shape[:2]
 
     # Calculate bbox
     # Ensure x1 < x2, y1 < y2
@@ -303,33 +316,55 @@ def get_track_status():
         
     return {"enabled": enabled}
 
+@app.get("/stats")
+def get_stats():
+    if not tracker_app:
+         raise HTTPException(status_code=503, detail="Tracker not initialized")
+    return tracker_app.get_stats()
+
+@app.get("/tracker_engine")
+def get_tracker_engine():
+    if not tracker_app:
+         raise HTTPException(status_code=503, detail="Tracker not initialized")
+    return tracker_app.tracker.get_stats()
+
+@app.post("/tracker_engine")
+def set_tracker_engine(data: TrackerEngine):
+    logger.info(f"🔧 API: Tracker engine {data.tracker_type}")
+    if not tracker_app:
+         raise HTTPException(status_code=503, detail="Tracker not initialized")
+    try:
+        engine = tracker_app.set_tracker_engine(data.tracker_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"tracker_type": engine}
+
+@app.get("/stream_stats")
+def get_stream_stats():
+    if not broadcaster:
+         raise HTTPException(status_code=503, detail="Tracker not initialized")
+    return broadcaster.get_stats()
+
 def generate_frames():
-    """Generator for MJPEG stream."""
-    while True:
-        if tracker_app and tracker_app.latest_frame is not None:
-            # Encode frame
-            try:
-                ret, buffer = cv2.imencode('.jpg', tracker_app.latest_frame)
-                if ret:
-                    frame_bytes = buffer.tobytes()
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            except Exception as e:
-                logger.error(f"Error encoding frame: {e}")
-        
-        # Limit streaming FPS to save bandwidth/cpu if needed
-        time.sleep(0.03) # ~30fps
+    """
+    Async generator for MJPEG stream, frames are encoded once by the shared
+    broadcaster. Streamed on the event loop, viewers do not occupy the
+    threadpool the control endpoints run on.
+    """
+    if not broadcaster:
+        raise HTTPException(status_code=503, detail="Tracker not initialized")
+    return broadcaster.frames()
 
 @app.get("/video_feed")
-def video_feed():
+async def video_feed():
     # Legacy default
-    return StreamingResponse(generate_frames(), media_type="multipart/x-mixed-replace; boundary=frame")
+    return StreamingResponse(generate_frames(), media_type=MEDIA_TYPE)
 
 # Dynamic endpoint based on config
 stream_endpoint = cfg.get("stream.web_endpoint", "/video1")
 @app.get(stream_endpoint)
-def custom_video_feed():
-    return StreamingResponse(generate_frames(), media_type="multipart/x-mixed-replace; boundary=frame")
+async def custom_video_feed():
+    return StreamingResponse(generate_frames(), media_type=MEDIA_TYPE)
 
 
 def run_server(host="0.0.0.0", port=8000):
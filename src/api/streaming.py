@@ -0,0 +1,176 @@
+"""
+MJPEG Streaming
+Encodes each rendered frame to JPEG once and fans the bytes out to every
+connected viewer
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+
+import cv2
+
+from src.core.stages import LatestValue, StageStats
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BOUNDARY = "frame"
+MEDIA_TYPE = f"multipart/x-mixed-replace; boundary={BOUNDARY}"
+
+
+class MjpegClient:
+    """One connected viewer: last part sent, delivered/dropped counts and FPS."""
+    def __init__(self, client_id):
+        self.id = client_id
+        self.seq = 0
+        self.sent = 0
+        self.dropped = 0  # Encoded parts replaced before this client got to them
+        self.stats = StageStats(f"client-{client_id}")
+        self.event = asyncio.Event()  # Set on the event loop when a new part is published
+
+    def snapshot(self):
+        snap = self.stats.snapshot()
+        snap.update(sent=self.sent, dropped=self.dropped)
+        return snap
+
+
+class MjpegBroadcaster:
+    """
+    Single encoder thread between the rendered frames (a LatestValue) and
+    all MJPEG viewers.
+
+    Every new frame is encoded once, keyed by its sequence number, into a
+    ready-to-send multipart part. Viewers wait for a part newer than the
+    last one they sent, so a slow viewer skips parts instead of holding
+    back the encoder or the other viewers. Nothing is encoded while no
+    viewer is connected.
+
+    Viewers are async generators on the server's event loop: they await a
+    per-client event that the encoder sets through call_soon_threadsafe,
+    so a connected viewer holds no worker thread and never sleeps.
+    """
+    def __init__(self, source, quality=95, poll_timeout=0.5):
+        self.source = source
+        self.params = [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)]
+        self.poll_timeout = poll_timeout
+        self.parts = LatestValue()
+        self.stats = StageStats("mjpeg-encode")
+        self.clients = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._has_clients = threading.Event()
+        self._loop = None  # Event loop the viewers run on
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="mjpeg-encoder", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self._has_clients.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+
+    def _run(self):
+        seq = 0
+        while self.running:
+            if not self._has_clients.wait(self.poll_timeout):
+                continue
+            new_seq, frame = self.source.get(seq, timeout=self.poll_timeout)
+            if frame is None:
+                continue
+            seq = new_seq
+            started = time.monotonic()
+            try:
+                ret, buffer = cv2.imencode('.jpg', frame, self.params)
+            except Exception as e:
+                logger.error(f"Error encoding frame: {e}")
+                continue
+            if not ret:
+                continue
+            self.parts.put(b'--' + BOUNDARY.encode() + b'\r\n'
+                           b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+            self.stats.record(started)
+            self._notify()
+
+    def _notify(self):
+        """Wakes the viewers from the encoder thread."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:
+            # Loop closed during shutdown
+            self._loop = None
+
+    def _wake(self):
+        with self._lock:
+            clients = list(self.clients.values())
+        for client in clients:
+            client.event.set()
+
+    @property
+    def active(self):
+        """True while at least one viewer is connected."""
+        return self._has_clients.is_set()
+
+    def subscribe(self):
+        with self._lock:
+            client = MjpegClient(next(self._ids))
+            self.clients[client.id] = client
+            self._has_clients.set()
+        logger.info(f"MJPEG client {client.id} connected ({len(self.clients)} total)")
+        return client
+
+    def unsubscribe(self, client):
+        with self._lock:
+            self.clients.pop(client.id, None)
+            if not self.clients:
+                self._has_clients.clear()
+        logger.info(f"MJPEG client {client.id} disconnected ({len(self.clients)} total)")
+
+    def _take(self, client, seq):
+        """Accounts a part about to be sent to client."""
+        if client.seq:
+            client.dropped += seq - client.seq - 1
+        client.seq = seq
+        client.sent += 1
+
+    async def frames(self):
+        """Async generator of multipart parts for one viewer, registered while it runs."""
+        self._loop = asyncio.get_running_loop()
+        client = self.subscribe()
+        try:
+            while self.running:
+                # Cleared before checking: a part published after the check
+                # sets the event again, since _wake only runs on this loop
+                client.event.clear()
+                seq, part = self.parts.peek()
+                if part is None or seq == client.seq:
+                    try:
+                        await asyncio.wait_for(client.event.wait(), self.poll_timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                started = time.monotonic()
+                self._take(client, seq)
+                # Awaits the client socket, a slow viewer only delays itself
+                yield part
+                client.stats.record(started)
+        finally:
+            self.unsubscribe(client)
+
+    def get_stats(self):
+        """Encoder cost (busy_ms per encoded frame) and per-viewer FPS/drops."""
+        with self._lock:
+            clients = list(self.clients.values())
+        return {
+            "encoder": self.stats.snapshot(),
+            "clients": {client.id: client.snapshot() for client in clients},
+        }
@@ -5,14 +5,20 @@ from src.core.config import cfg
 from src.hardware.camera import Camera
 from src.hardware.gimbal import GimbalController
 from src.detection.detector import HailoDetector
+from src.detection.scheduler import DetectionScheduler
 from src.detection.tracker import ObjectTracker
-from src.utils.visualization import draw_detections, draw_tracking_info, draw_hud
+from src.utils.visualization import OverlayCompositor
 from src.utils.logger import get_logger
 from src.core.version import get_version
+from src.core.stages import LatestValue, StageStats, StageWorker
+from src.core.rtsp_output import RtspOutput, StreamQualityController
 import psutil
 
 logger = get_logger(__name__)
 
+def _release_item(item):
+    item[0].release()
+
 class TrackingApp:
     def __init__(self, mode="debug"):
         self.mode = mode
@@ -23,8 +29,17 @@ class TrackingApp:
         self.gimbal = GimbalController()
         self.detector = HailoDetector()
         self.tracker = ObjectTracker(detector=self.detector)
+        self.detection_scheduler = DetectionScheduler(
+            enabled=cfg.get("detection.scheduler.enabled", True),
+            min_interval=cfg.get("detection.scheduler.min_interval", 1),
+            max_interval=cfg.get("detection.scheduler.max_interval", 10),
+            confidence_low=cfg.get("detection.scheduler.confidence_low", 0.4),
+            confidence_high=cfg.get("detection.scheduler.confidence_high", 0.8),
+            speed_ref=cfg.get("detection.scheduler.speed_ref", 20.0),
+        )
         
         self.latest_detections = []
+        self.pending_target_label = None  # Detector class of the selected target, for re-acquisition
         
         self.running = False
         self.fps = 0
@@ -33,12 +48,26 @@ class TrackingApp:
         self.frame_count = 0
         self.start_time = time.time()
         self.latest_frame = None
+        self.last_frame_seq = 0
+        self.frame_timeout = 0.1 # Seconds to wait for a new frame before re-checking state
+        self.output_frames = LatestValue() # Rendered frames, for stream consumers
+        self.compositor = OverlayCompositor(self.mode, self.version)
+        self._output_consumers = [] # Callables telling whether an external viewer is attached
+        
+        # Staged pipeline: inference and output run on their own workers
+        self.pipelined = cfg.get("system.pipeline", False)
+        self.max_detection_lag = 15 # Frames, older detections are not overlaid
+        self._detection_result = (-self.max_detection_lag - 1, [])
+        self._workers = []
+        self.stage_stats = {name: StageStats(name) for name in ("control", "inference", "output")}
+        self.last_stats_report = time.monotonic()
+        self.stats_report_interval = cfg.get("system.stats_interval", 10)
         
         # Output Streamer
         self.stream_type = cfg.get("stream.type", "web")
         self.rtsp_url = cfg.get("stream.rtsp_url", "rtsp://127.0.0.1:8554/stream")
         print(self.rtsp_url)
-        self.stream_writer = None
+        self.rtsp_output = None
         
         # Mouse Interaction State
         self.drag_start_point = None
@@ -81,131 +110,343 @@ class TrackingApp:
     def _setup_streamer(self):
         if self.stream_type == "rtsp":
             logger.info(f"Setting up RTSP Streamer to {self.rtsp_url}")
-            # GStreamer pipeline for RTSP push
+            # GStreamer pipeline for RTSP push on its own worker, reopened on failure
             # Requires an RTSP server listening (e.g., mediamtx)
 
             w = cfg.get("camera.width", 1280)
             h = cfg.get("camera.height", 720)
             fps = cfg.get("camera.fps", 30)
 
-            gst_out = (
-                f"appsrc ! videoconvert ! x264enc tune=zerolatency bitrate=2000 speed-preset=ultrafast ! "
-                f"rtspclientsink location={self.rtsp_url}"
-            )
+            controller = None
+            if cfg.get("stream.quality.enabled", False):
+                # Steps resolution/fps/bitrate between tiers, backing off when the
+                # encoder or the tracking loop (control stage) falls behind
+                controller = StreamQualityController(
+                    tiers=cfg.get("stream.quality.tiers"),
+                    start_tier=cfg.get("stream.quality.start_tier"),
+                    interval=cfg.get("stream.quality.interval", 2.0),
+                    up_hold=cfg.get("stream.quality.up_hold", 10.0),
+                    down_busy_ratio=cfg.get("stream.quality.down_busy_ratio", 0.8),
+                    up_busy_ratio=cfg.get("stream.quality.up_busy_ratio", 0.5),
+                    down_drop_ratio=cfg.get("stream.quality.down_drop_ratio", 0.1),
+                    down_backlog_ratio=cfg.get("stream.quality.down_backlog_ratio", 0.3),
+                    target_fps=fps,
+                    tracking_fps=lambda: self.stage_stats["control"].snapshot()["fps"],
+                    min_tracking_ratio=cfg.get("stream.quality.min_tracking_ratio", 0.9),
+                )
 
-            self.stream_writer = cv2.VideoWriter(gst_out, cv2.CAP_GSTREAMER, 0, fps, (w, h), True)
-            if not self.stream_writer.isOpened():
-                logger.warning(f"Failed to open RTSP stream writer to {self.rtsp_url}. RTSP push will be disabled.")
-                self.stream_writer = None
-            else:
-                logger.info("RTSP Stream writer opened successfully")
+            self.rtsp_output = RtspOutput(
+                self.rtsp_url, (w, h), fps,
+                bitrate=cfg.get("stream.bitrate", 2000),
+                speed_preset=cfg.get("stream.speed_preset", "ultrafast"),
+                restart_delay=cfg.get("stream.restart_delay", 1.0),
+                controller=controller,
+                stall_timeout=cfg.get("stream.stall_timeout", 5.0),
+                health_interval=cfg.get("stream.health_interval", 5.0),
+            )
+            self.rtsp_output.start()
 
     def loop(self):
+        if self.pipelined:
+            return self._pipeline_loop()
+
         try:
             while self.running:
-                loop_start = time.time()
-                
-                # 0. Check for Background Updates (v3 -> v4 transition)
-                if time.time() - self.last_update_check > self.update_check_interval:
-                    from src.core.version import check_and_apply_update
-                    check_and_apply_update()
-                    self.last_update_check = time.time()
-
-                # 1. Get Frame
-                ret, frame = self.camera.read()
-                if not ret or frame is None:
-                    time.sleep(0.01)
+                self._check_updates()
+                self._report_stats()
+
+                # 1. Get Frame (shared read-only view, blocks until a new one arrives)
+                ref = self.camera.wait_for_frame(self.last_frame_seq, timeout=self.frame_timeout)
+                if ref is None:
                     continue
 
-                frame_h, frame_w = frame.shape[:2]
-                center_x, center_y = frame_w // 2, frame_h // 2
-
-                # Check for external tracking command
-                if hasattr(self, 'pending_tracker_init') and self.pending_tracker_init:
-                    logger.info(f"Initializing tracker from API: {self.pending_tracker_init}")
-                    self.tracker.init(frame, self.pending_tracker_init)
-                    self.pending_tracker_init = None
-
-                # 2. Tracking Logic
-                if self.tracker.tracking_active:
-                    success, bbox = self.tracker.update(frame)
-                    if success:
-                        x, y, w, h = [int(v) for v in bbox]
-                        target_x = x + w // 2
-                        target_y = y + h // 2
-                        
-                        error_x = target_x - center_x
-                        error_y = target_y - center_y
-                        
-                        # Update Gimbal
-                        self.gimbal.update_tracking(error_x, error_y)
-                        
-                        # Visualize (Always draw for streaming)
-                        draw_tracking_info(frame, bbox, center_x, center_y, error_x, error_y)
-                    else:
-                        # With the new auto-recovery, we don't immediately set tracking_active = False.
-                        # We let the tracker handle recovery. If it's truly lost long-term:
-                        if self.tracker.status == "LOST":
-                            logger.info("Target permanently lost.")
-                            self.tracker.tracking_active = False
-                            self.gimbal.stop()
-                        else:
-                            # Still searching or occluded - keep gimbal at last known speed or stop depending on preference
-                            # For safety, let's stop gimbal if object is not verified for 0.5s
-                            if self.tracker.frames_since_lost > 15:
-                                self.gimbal.stop()
-                
-                # 3. Detection Logic (if not tracking)
-                elif self.detector.enabled:
-                    detections = self.detector.detect(frame)
-                    self.latest_detections = detections # Store for mouse selection
-                    # Always draw detections for streaming
-                    draw_detections(frame, detections)
-                        
-                # 4. Display & Input
-                self._calculate_fps()
-                # Always draw HUD for streaming
-                draw_hud(frame, self.mode, self.fps, version=self.version, cpu=self.cpu_usage)
-                
-                # Store processed frame for streaming
-                self.latest_frame = frame.copy()
-                
-                # Write to RTSP if enabled
-                if self.stream_writer is not None:
-                     # Resize to configured stream dimensions to avoid GStreamer errors
-                     w = cfg.get("camera.width", 1280)
-                     h = cfg.get("camera.height", 720)
-
-                     if frame.shape[1] != w or frame.shape[0] != h:
-                         out_frame = cv2.resize(frame, (w, h))
-                     else:
-                         out_frame = frame
-
-                     self.stream_writer.write(out_frame)
-                
-                if not self.headless:
-                    # Draw ROI selection if dragging
-                    if self.is_dragging and self.drag_start_point and self.current_mouse_point:
-                        cv2.rectangle(frame, self.drag_start_point, self.current_mouse_point, (255, 255, 0), 2)
-                        
-                    cv2.imshow("Tracker", frame)
-                    
-                    key = cv2.waitKey(1) & 0xFF
-                    self._handle_input(key, frame)
-                    
-                    if key == ord('q'):
-                        self.running = False
-                else:
-                    # In headless, minimal sleep to prevent CPU hogging if capture is non-blocking (though read() is usually blocking/rate-limited)
-                    # But we also need to allow API/Signals to process.
-                    # Since Camera.read() is threaded and Rate-limited by FPS, we are fine.
-                    time.sleep(0.001)
+                with ref:
+                    frame, frame_ts = ref.frame, ref.timestamp
+                    self.last_frame_seq = ref.seq
+                    started = time.monotonic()
+
+                    # 2. Tracking Logic
+                    tracking, track_info = self._control_step(frame)
+                    self.stage_stats["control"].record(started, frame_ts)
+
+                    # 3. Detection Logic (rate picked by the detection scheduler)
+                    detections = None
+                    if self._should_detect(tracking, ref.seq):
+                        started = time.monotonic()
+                        # Queue this frame on the NPU and pick up whatever finished meanwhile,
+                        # inference overlaps with drawing and waiting for the next frame
+                        self.detector.detect_async(frame, ref.seq)
+                        self._collect_detections()
+                        detections = self._recent_detections(ref.seq)
+                        self.stage_stats["inference"].record(started, frame_ts)
+                    elif self.detector.enabled:
+                        # Still pick up finished inferences so their bindings are recycled
+                        self._collect_detections()
+
+                    # 4. Display & Input
+                    self._calculate_fps()
+                    started = time.monotonic()
+                    self._render_output(frame, track_info, detections)
+                    self.stage_stats["output"].record(started, frame_ts)
+
+                    if not self.headless:
+                        self._display(self.latest_frame, clean_frame=frame)
             
         except KeyboardInterrupt:
             print("Interrupted")
         finally:
             self.cleanup()
 
+    def _pipeline_loop(self):
+        """
+        Staged loop: this thread only runs tracking and gimbal control.
+        Detection and output (HUD, streaming) run on their own workers and are
+        fed through latest-value handoffs, so a slow stage drops frames
+        instead of stalling the control loop.
+        """
+        # Queued items hold a FrameRef; release it if a newer item replaces it
+        self._infer_input = LatestValue(on_drop=_release_item)
+        self._output_input = LatestValue(on_drop=_release_item)
+        self._workers = [
+            StageWorker("inference", self._infer_input, self._inference_stage, self.stage_stats["inference"]),
+            StageWorker("output", self._output_input, self._output_stage, self.stage_stats["output"]),
+        ]
+        for worker in self._workers:
+            worker.start()
+        logger.info("Pipelined loop started (control | inference | output)")
+
+        try:
+            shown_seq = 0
+            while self.running:
+                self._check_updates()
+                self._report_stats()
+
+                ref = self.camera.wait_for_frame(self.last_frame_seq, timeout=self.frame_timeout)
+                if ref is None:
+                    continue
+
+                with ref:
+                    frame, frame_ts = ref.frame, ref.timestamp
+                    self.last_frame_seq = ref.seq
+                    started = time.monotonic()
+
+                    tracking, track_info = self._control_step(frame)
+
+                    detections = None
+                    if self._should_detect(tracking, ref.seq):
+                        self._infer_input.put((ref.retain(),))
+                        detections = self._recent_detections(ref.seq)
+
+                    self.stage_stats["control"].record(started, frame_ts)
+                    self._calculate_fps()
+                    if self._output_wanted():
+                        self._output_input.put((ref.retain(), track_info, detections))
+
+                    if not self.headless:
+                        seq, shown = self.output_frames.peek()
+                        if shown is not None and seq != shown_seq:
+                            shown_seq = seq
+                            self._display(shown, clean_frame=frame)
+                        else:
+                            self._handle_key(frame)
+
+        except KeyboardInterrupt:
+            print("Interrupted")
+        finally:
+            self.cleanup()
+
+    def _inference_stage(self, item):
+        with item[0] as ref:
+            self.detector.detect_async(ref.frame, ref.seq)
+            # Only block when the NPU queue is full
+            self._collect_detections(timeout=0.0 if self.detector.has_capacity() else 1.0)
+            return ref.timestamp
+
+    def _should_detect(self, tracking, frame_seq):
+        """
+        Whether to queue this frame on the detector. The scheduler picks the
+        rate from tracker confidence, target speed and the NPU queue depth:
+        rarely for a confidently held, slow target, often while the tracker
+        is unsure or the target is fast. Engines that track on detections are
+        not throttled, a longer interval would only age their boxes. While a
+        target is lost, detections only help through re-acquisition, which
+        runs at most every reacquire_interval frames.
+        """
+        if not self.detector.enabled:
+            return False
+        tracker = self.tracker
+        required = tracking and tracker.tracks_on_detections
+        floor = None
+        if tracking and not required and tracker.lost:
+            if not tracker.reacquire_enabled:
+                return False
+            floor = tracker.reacquire_interval
+        return self.detection_scheduler.should_detect(
+            frame_seq=frame_seq,
+            confidence=tracker.current_confidence if tracking else 0.0,
+            speed=tracker.target_speed if tracking else 0.0,
+            queue_depth=self.detector.in_flight,
+            queue_capacity=self.detector.max_in_flight,
+            required=required,
+            floor=floor,
+        )
+
+    def _collect_detections(self, timeout=0.0):
+        for seq, detections in self.detector.poll_results(timeout):
+            self.latest_detections = detections # Store for mouse selection
+            self._detection_result = (seq, detections)
+            self.tracker.feed_detections(seq, detections)
+
+    def _recent_detections(self, frame_seq):
+        """Latest detections, or None if they come from a frame that is too old to overlay."""
+        seq, detections = self._detection_result
+        if frame_seq - seq <= self.max_detection_lag:
+            return detections
+        return None
+
+    def _output_stage(self, item):
+        ref, track_info, detections = item
+        with ref:
+            self._render_output(ref.frame, track_info, detections)
+            return ref.timestamp
+
+    def _check_updates(self):
+        # Check for Background Updates (v3 -> v4 transition)
+        if time.time() - self.last_update_check > self.update_check_interval:
+            from src.core.version import check_and_apply_update
+            check_and_apply_update()
+            self.last_update_check = time.time()
+
+    def _control_step(self, frame):
+        """
+        Tracker update and gimbal command for one frame.
+        Returns (tracking, track_info) where tracking is False when the
+        detector should run on this frame and track_info holds the tracking
+        overlay values for OverlayCompositor.render (or None).
+        """
+        frame_h, frame_w = frame.shape[:2]
+        center_x, center_y = frame_w // 2, frame_h // 2
+
+        # Check for external tracking command
+        if hasattr(self, 'pending_tracker_init') and self.pending_tracker_init:
+            logger.info(f"Initializing tracker from API: {self.pending_tracker_init}")
+            self.tracker.init(frame, self.pending_tracker_init, label=self.pending_target_label)
+            self.pending_tracker_init = None
+
+        if not self.tracker.tracking_active:
+            return False, None
+
+        track_info = None
+        success, bbox = self.tracker.update(frame)
+        if success:
+            x, y, w, h = [int(v) for v in bbox]
+            target_x = x + w // 2
+            target_y = y + h // 2
+            
+            error_x = target_x - center_x
+            error_y = target_y - center_y
+            
+            # Update Gimbal
+            self.gimbal.update_tracking(error_x, error_y)
+            track_info = (bbox, center_x, center_y, error_x, error_y)
+        else:
+            # With the new auto-recovery, we don't immediately set tracking_active = False.
+            # We let the tracker handle recovery. If it's truly lost long-term:
+            if self.tracker.status == "LOST":
+                logger.info("Target permanently lost.")
+                self.tracker.tracking_active = False
+                self.gimbal.stop()
+            else:
+                # Still searching or occluded - keep gimbal at last known speed or stop depending on preference
+                # For safety, let's stop gimbal if object is not verified for 0.5s
+                if self.tracker.frames_since_lost > 15:
+                    self.gimbal.stop()
+        return True, track_info
+
+    def add_output_consumer(self, is_active):
+        """
+        Registers a callable that returns True while an external viewer (e.g.
+        the web stream) needs rendered frames.
+        """
+        self._output_consumers.append(is_active)
+
+    def _output_wanted(self):
+        """True if anything consumes rendered frames: local window, RTSP push or a viewer."""
+        return (not self.headless or self.rtsp_output is not None
+                or any(is_active() for is_active in self._output_consumers))
+
+    def _output_size(self):
+        """
+        Resolution the overlays are rendered at. Headless with RTSP push:
+        the stream size, so the push needs no resize. Otherwise the camera
+        size, the local window maps mouse clicks to camera pixels.
+        """
+        if self.headless and self.rtsp_output is not None:
+            return self.rtsp_output.size
+        return None
+
+    def _render_output(self, frame, track_info, detections):
+        """
+        Composes overlays on an output copy of the (shared, read-only)
+        camera frame and hands it to the stream outputs. Does nothing while
+        no output is consumed.
+        """
+        if not self._output_wanted():
+            return
+        frame = self.compositor.render(
+            frame, self._output_size(), track_info, detections, fps=self.fps, cpu=self.cpu_usage
+        )
+        
+        # Store processed frame for streaming
+        self.latest_frame = frame
+        self.output_frames.put(frame)
+        
+        # Push to RTSP if enabled (latest frame wins, never blocks)
+        if self.rtsp_output is not None:
+            self.rtsp_output.submit(frame)
+
+    def _display(self, frame, clean_frame):
+        # Draw ROI selection if dragging (on a copy, frame is also being streamed)
+        if self.is_dragging and self.drag_start_point and self.current_mouse_point:
+            frame = frame.copy()
+            cv2.rectangle(frame, self.drag_start_point, self.current_mouse_point, (255, 255, 0), 2)
+            
+        cv2.imshow("Tracker", frame)
+        self._handle_key(clean_frame)
+
+    def _handle_key(self, frame):
+        key = cv2.waitKey(1) & 0xFF
+        self._handle_input(key, frame)
+        
+        if key == ord('q'):
+            self.running = False
+
+    def _report_stats(self):
+        now = time.monotonic()
+        if now - self.last_stats_report < self.stats_report_interval:
+            return
+        self.last_stats_report = now
+        parts = []
+        for name, snap in self.get_stats()["stages"].items():
+            parts.append(f"{name}: {snap['fps']:.1f}fps {snap['busy_ms']:.1f}ms busy {snap['latency_ms']:.1f}ms lat")
+        logger.info("Stages | " + " | ".join(parts))
+
+    def get_stats(self):
+        """Per-stage throughput and latency."""
+        stages = {"capture": self.camera.stats.snapshot()}
+        stages["capture"]["overruns"] = self.camera.ring.overruns
+        for name, stats in self.stage_stats.items():
+            stages[name] = stats.snapshot()
+        return {
+            "fps": round(self.fps, 1),
+            "pipelined": self.pipelined,
+            "stages": stages,
+            "detector": self.detector.get_stats(),
+            "detection_scheduler": self.detection_scheduler.get_stats(),
+            "rtsp": self.rtsp_output.get_stats() if self.rtsp_output else None,
+            "tracker": self.tracker.get_stats(),
+        }
+
     def _handle_input(self, key, frame):
         if key == ord('s'): # Select ROI
             self.gimbal.stop()
@@ -235,8 +476,12 @@ class TrackingApp:
 
     def cleanup(self):
         logger.info("Cleaning up...")
-        if self.stream_writer:
-            self.stream_writer.release()
+        for worker in self._workers:
+            worker.stop()
+        self._workers = []
+
+        if self.rtsp_output:
+            self.rtsp_output.stop()
             
         self.camera.stop()
         self.gimbal.stop() # Stop movement
@@ -274,7 +519,7 @@ class TrackingApp:
                     if w > 0 and h > 0:
                         bbox = (x1, y1, w, h)
                         logger.info(f"Selected Custom ROI: {bbox}")
-                        self.pending_tracker_init = bbox
+                        self.set_tracking_target(bbox)
                         
                 else: # Click behavior (Object Selection)
                     logger.info(f"Mouse click at ({x}, {y})")
@@ -283,7 +528,7 @@ class TrackingApp:
                          dx, dy, dw, dh = [int(v) for v in bbox]
                          if dx <= x <= dx + dw and dy <= y <= dy + dh:
                              logger.info(f"Selected object: {label} ({conf:.2f})")
-                             self.pending_tracker_init = (dx, dy, dw, dh)
+                             self.set_tracking_target((dx, dy, dw, dh), label=label)
                              break
                              
             self.drag_start_point = None
@@ -295,14 +540,17 @@ class TrackingApp:
              logger.info("Tracking canceled via mouse.")
 
     # API Methods for Production Mode
-    def set_tracking_target(self, bbox):
+    def set_tracking_target(self, bbox, label=None):
         """
         Sets the tracking target from external coordination.
         bbox: (x, y, w, h)
+        label: detector class of the target if it was picked from detections,
+               limits re-acquisition candidates to that class
         """
         # We need the current frame to init. 
         # So we set a flag 'pending_init_tracker' = bbox
         # And handle it in the loop
+        self.pending_target_label = label
         self.pending_tracker_init = bbox
 
     def cancel_tracking(self):
@@ -327,13 +575,14 @@ class TrackingApp:
         Moves the gimbal to center the given normalized point.
         Initializes a visual tracker at the point to ensure it stays centered.
         """
-        current_frame = self.latest_frame
-        if current_frame is None:
+        # Camera frame size (rendered output frames may be downscaled)
+        frame_shape = self.camera.frame_shape
+        if frame_shape is None:
             # Fallback to config dims
             h = cfg.get("camera.height", 720)
             w = cfg.get("camera.width", 1280)
         else:
-            h, w = current_frame.shape[:2]
+            h, w = frame_shape[:2]
             
         # Target pixel coordinates
         target_x = int(x_norm * w)
@@ -352,9 +601,19 @@ class TrackingApp:
              self.tracker.tracker_type = 'CSRT'
              
         # Trigger tracker initialization in the main loop
-        self.pending_tracker_init = bbox
+        self.set_tracking_target(bbox)
         logger.info(f"Hold Point requested at ({target_x}, {target_y}). Initializing tracker.")
 
+    def set_tracker_engine(self, name):
+        """
+        Switches the tracker engine. An active track continues with the new
+        engine from its last known box on the next frame.
+        Raises ValueError for unknown engine names.
+        """
+        self.tracker.tracker_type = name
+        logger.info(f"Tracker engine set to {name}")
+        return self.tracker.tracker_type
+
 
     def center_gimbal(self):
         """Centers the gimbal."""
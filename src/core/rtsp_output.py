@@ -0,0 +1,392 @@
+"""
+RTSP Output
+Pushes rendered frames to an RTSP server (e.g. mediamtx) through a
+GStreamer x264 pipeline on its own worker thread
+"""
+
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+import cv2
+
+from src.core.stages import LatestValue, StageStats
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+DEFAULT_TIERS = [
+    {"width": 640, "height": 360, "fps": 15, "bitrate": 600},
+    {"width": 960, "height": 540, "fps": 20, "bitrate": 1200},
+    {"width": 1280, "height": 720, "fps": 30, "bitrate": 2000},
+]
+
+
+def rtsp_stream_published(url, timeout=1.0):
+    """
+    Asks the RTSP server whether url is being published (RTSP DESCRIBE).
+    Returns False if the server is unreachable or answers 404, True for any
+    other answer (an auth challenge still means the server is up).
+    """
+    parsed = urlparse(url)
+    try:
+        with socket.create_connection((parsed.hostname, parsed.port or 554), timeout=timeout) as sock:
+            sock.settimeout(timeout)
+            sock.sendall(f"DESCRIBE {url} RTSP/1.0\r\nCSeq: 1\r\nAccept: application/sdp\r\n\r\n".encode())
+            status = sock.recv(256).split(b"\r\n", 1)[0].split()
+    except OSError:
+        return False
+    return not (len(status) >= 2 and status[1] == b"404")
+
+
+class StreamQualityController:
+    """
+    Picks the stream tier (resolution, frame rate, bitrate) from how well
+    the RTSP worker keeps up.
+
+    Every interval seconds the worker reports its encode time per frame,
+    how often a new frame was already waiting after a write (backlog) and
+    how many frames were dropped. The controller steps one tier down as
+    soon as any of them shows overload, or the tracking loop falls below
+    min_tracking_ratio of target_fps. It steps one tier up only after
+    up_hold seconds in which the encode time, scaled to the next tier's
+    pixel count and frame rate, stays below up_busy_ratio of the frame
+    period with no drops (hysteresis), so the pipeline is not rebuilt back
+    and forth.
+
+    tiers are ordered from lowest to highest quality.
+    """
+    def __init__(self, tiers=None, start_tier=None, interval=2.0, up_hold=10.0,
+                 down_busy_ratio=0.8, up_busy_ratio=0.5, down_drop_ratio=0.1, down_backlog_ratio=0.3,
+                 target_fps=None, tracking_fps=None, min_tracking_ratio=0.9):
+        self.tiers = [dict(tier) for tier in (tiers or DEFAULT_TIERS)]
+        if not self.tiers:
+            raise ValueError("At least one stream quality tier is required")
+        top = len(self.tiers) - 1
+        self.index = top if start_tier is None else min(max(int(start_tier), 0), top)
+        self.interval = interval
+        self.up_hold = up_hold
+        self.down_busy_ratio = down_busy_ratio
+        self.up_busy_ratio = up_busy_ratio
+        self.down_drop_ratio = down_drop_ratio
+        self.down_backlog_ratio = down_backlog_ratio
+        self.target_fps = target_fps
+        self.tracking_fps = tracking_fps  # Callable returning the tracking loop FPS, or None
+        self.min_tracking_ratio = min_tracking_ratio
+
+        now = time.monotonic()
+        self._last_eval = now
+        self._healthy_since = now
+        self._last = (0, 0, 0)  # (submitted, written, dropped) at the last evaluation
+        self._backlogged = 0
+        self._rebase = False
+        self.changes = 0
+        self.reason = None
+
+    @property
+    def tier(self):
+        return self.tiers[self.index]
+
+    def _tracking_ok(self):
+        if self.tracking_fps is None or not self.target_fps:
+            return True
+        return self.tracking_fps() >= self.target_fps * self.min_tracking_ratio
+
+    def update(self, busy_ms, submitted, written, dropped, backlogged):
+        """
+        Called by the worker after each write with its running totals.
+        Returns the new tier when it changes, otherwise None.
+        """
+        now = time.monotonic()
+        if now - self._last_eval < self.interval:
+            return None
+        self._last_eval = now
+
+        if self._rebase:
+            # First evaluation after a tier change: only take new baselines,
+            # drops and encode times from the rebuild are not counted
+            self._rebase = False
+            self._last = (submitted, written, dropped)
+            self._backlogged = backlogged
+            return None
+
+        last_submitted, last_written, last_dropped = self._last
+        self._last = (submitted, written, dropped)
+        frames_in = max(1, submitted - last_submitted)
+        frames_out = max(1, written - last_written)
+        drop_ratio = (dropped - last_dropped) / frames_in
+        backlog_ratio = (backlogged - self._backlogged) / frames_out
+        self._backlogged = backlogged
+        busy_ratio = busy_ms / 1000.0 * self.tier["fps"]  # Encode time over frame period
+
+        reason = None
+        if busy_ratio > self.down_busy_ratio:
+            reason = f"encode {busy_ms:.1f} ms/frame"
+        elif drop_ratio > self.down_drop_ratio:
+            reason = f"{drop_ratio:.0%} frames dropped"
+        elif backlog_ratio > self.down_backlog_ratio:
+            reason = f"writer backlog {backlog_ratio:.0%}"
+        elif not self._tracking_ok():
+            reason = "tracking below target FPS"
+
+        if reason is not None:
+            self._healthy_since = now
+            if self.index > 0:
+                return self._step(-1, reason, now)
+            return None
+
+        if self.index == len(self.tiers) - 1:
+            return None
+        # Encode time expected at the next tier, assuming it scales with pixel count
+        tier, up = self.tier, self.tiers[self.index + 1]
+        scale = (up["width"] * up["height"]) / float(tier["width"] * tier["height"])
+        up_busy_ratio = busy_ms / 1000.0 * scale * up["fps"]
+        if up_busy_ratio > self.up_busy_ratio or drop_ratio > 0:
+            self._healthy_since = now
+        elif now - self._healthy_since >= self.up_hold:
+            self._healthy_since = now
+            return self._step(1, f"encode {busy_ms:.1f} ms/frame, no drops", now)
+        return None
+
+    def rebase(self):
+        """
+        Restart the measurements after the pipeline was reopened: frames
+        dropped while no writer was open are not counted, the next
+        evaluation after interval only takes new baselines.
+        """
+        self._last_eval = time.monotonic()
+        self._rebase = True
+
+    def _step(self, direction, reason, now):
+        self.index += direction
+        self.changes += 1
+        self.reason = reason
+        # Let the rebuilt pipeline settle for an interval before measuring again
+        self._last_eval = now + self.interval
+        self._rebase = True
+        tier = self.tier
+        logger.info(f"Stream quality {'down' if direction < 0 else 'up'} to tier {self.index} "
+                    f"({tier['width']}x{tier['height']}@{tier['fps']} {tier['bitrate']} kbps): {reason}")
+        return tier
+
+    def get_stats(self):
+        return {"tier": self.index, "changes": self.changes, "reason": self.reason, **self.tier}
+
+
+class RtspOutput:
+    """
+    RTSP push worker.
+
+    submit() never blocks: frames go through a latest-wins handoff, so
+    encoder hiccups or network backpressure drop stream frames (counted in
+    dropped) instead of stalling the caller. Resizing to the stream size,
+    encoding and the push all run on the worker. If the pipeline cannot be
+    opened or fails, the worker releases it and reopens it after
+    restart_delay, doubling the delay up to max_restart_delay until the
+    stream works again.
+
+    cv2.VideoWriter.write does not raise when the GStreamer pipeline fails
+    mid-stream (it logs and returns), so failures are detected explicitly:
+    the writer reports closed, a single write blocks longer than
+    stall_timeout, or every health_interval seconds health_check(url)
+    reports the stream is no longer published on the server.
+
+    With a StreamQualityController the size, frame rate and bitrate follow
+    its current tier. Frames arriving faster than the stream frame rate are
+    skipped (paced), and the pipeline is only rebuilt when the tier changes.
+    """
+    def __init__(self, url, size, fps, bitrate=2000, speed_preset="ultrafast",
+                 restart_delay=1.0, max_restart_delay=30.0, poll_timeout=0.5, controller=None,
+                 stall_timeout=5.0, health_interval=5.0, health_check=rtsp_stream_published, writer_factory=None):
+        self.url = url
+        self.size = tuple(size)  # (width, height)
+        self.fps = fps
+        self.bitrate = bitrate
+        self.speed_preset = speed_preset
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.poll_timeout = poll_timeout
+        self.controller = controller
+        self.stall_timeout = stall_timeout
+        self.health_interval = health_interval  # Seconds, 0 disables the health check
+        self.health_check = health_check
+        # Callable (pipeline, fps, size) -> writer, cv2.VideoWriter on GStreamer by default
+        self.writer_factory = writer_factory or (
+            lambda pipeline, fps, size: cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0, fps, size, True)
+        )
+        if controller is not None:
+            self._apply(controller.tier)
+
+        self.frames = LatestValue()
+        self.stats = StageStats("rtsp")
+        self.writer = None
+        self.restarts = 0
+        self.failures = 0
+        self.written = 0
+        self.paced = 0  # Frames skipped to hold the stream frame rate
+        self.backlogged = 0  # Writes after which a newer frame was already waiting
+        self._due = 0.0
+        self._next_health = 0.0
+        self.running = False
+        self.thread = None
+
+    def pipeline(self):
+        return (
+            f"appsrc ! videoconvert ! x264enc tune=zerolatency bitrate={self.bitrate} "
+            f"speed-preset={self.speed_preset} ! rtspclientsink location={self.url}"
+        )
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="rtsp-output", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+        self._close()
+
+    def submit(self, frame):
+        """Queues frame for the stream, replacing any frame not yet written."""
+        self.frames.put(frame)
+
+    @property
+    def dropped(self):
+        return self.frames.dropped
+
+    def _open(self):
+        writer = self.writer_factory(self.pipeline(), self.fps, self.size)
+        if not writer.isOpened():
+            writer.release()
+            return False
+        self.writer = writer
+        # Give the server time to register the new publisher before checking it
+        self._next_health = time.monotonic() + self.health_interval
+        logger.info(f"RTSP output open: {self.url} {self.size[0]}x{self.size[1]}@{self.fps} {self.bitrate} kbps")
+        return True
+
+    def _close(self):
+        writer, self.writer = self.writer, None
+        if writer is not None:
+            writer.release()
+
+    def _apply(self, tier):
+        """Adopts a quality tier, returns True if the pipeline has to be rebuilt."""
+        size = (int(tier["width"]), int(tier["height"]))
+        changed = (size, tier["fps"], tier["bitrate"]) != (self.size, self.fps, self.bitrate)
+        self.size, self.fps, self.bitrate = size, tier["fps"], tier["bitrate"]
+        return changed
+
+    def _adapt(self):
+        tier = self.controller.update(
+            self.stats.snapshot()["busy_ms"], self.frames.seq, self.written, self.dropped, self.backlogged
+        )
+        if tier is not None and self._apply(tier):
+            self._close()
+
+    def _wait_restart(self, delay):
+        """Sleeps delay seconds in poll_timeout steps, returns False if stopped meanwhile."""
+        end = time.monotonic() + delay
+        while self.running and time.monotonic() < end:
+            time.sleep(min(self.poll_timeout, max(0.0, end - time.monotonic())))
+        return self.running
+
+    def _write(self, frame):
+        """Writes one frame, raises RuntimeError if the pipeline is found dead."""
+        started = time.monotonic()
+        # Resize to the stream dimensions to avoid GStreamer errors
+        if (frame.shape[1], frame.shape[0]) != self.size:
+            frame = cv2.resize(frame, self.size)
+        self.writer.write(frame)
+        if not self.writer.isOpened():
+            raise RuntimeError("writer closed")
+        elapsed = time.monotonic() - started
+        if elapsed > self.stall_timeout:
+            raise RuntimeError(f"write blocked for {elapsed:.1f}s")
+
+    def _check_health(self):
+        """
+        Every health_interval, raises RuntimeError if the server no longer
+        lists the stream. Returns True once the stream is known to work:
+        the check passed on this call, or it is disabled.
+        """
+        if not self.health_interval or self.health_check is None:
+            return True
+        now = time.monotonic()
+        if now < self._next_health:
+            return False
+        self._next_health = now + self.health_interval
+        if not self.health_check(self.url):
+            raise RuntimeError("stream no longer published on the server")
+        return True
+
+    def _run(self):
+        seq = 0
+        delay = self.restart_delay
+        failed = False  # Pipeline went down since the last open
+        while self.running:
+            if self.writer is None:
+                if not self._open():
+                    self.failures += 1
+                    failed = True
+                    logger.warning(f"Failed to open RTSP stream writer to {self.url}, retrying in {delay:.1f}s")
+                    if not self._wait_restart(delay):
+                        break
+                    delay = min(delay * 2, self.max_restart_delay)
+                    continue
+                if failed and self.controller is not None:
+                    # Frames dropped while the pipeline was down say nothing
+                    # about the encoder load
+                    self.controller.rebase()
+                failed = False
+
+            seq, frame = self.frames.get(seq, timeout=self.poll_timeout)
+            if frame is None:
+                continue
+
+            started = time.monotonic()
+            # Hold the stream frame rate, with a quarter period of jitter tolerance
+            period = 1.0 / self.fps
+            if started < self._due - period / 4:
+                self.paced += 1
+                continue
+            self._due = max(self._due + period, started - period)
+            try:
+                self._write(frame)
+                self.written += 1
+                if self.frames.pending:
+                    self.backlogged += 1
+                self.stats.record(started)
+                verified = self._check_health()
+            except Exception as e:
+                self.failures += 1
+                self.restarts += 1
+                failed = True
+                logger.error(f"RTSP pipeline failed ({e}), restarting in {delay:.1f}s")
+                self._close()
+                if not self._wait_restart(delay):
+                    break
+                delay = min(delay * 2, self.max_restart_delay)
+                continue
+            if verified:
+                # Back-off restarts from restart_delay only once the stream works again
+                delay = self.restart_delay
+            if self.controller is not None:
+                self._adapt()
+
+    def get_stats(self):
+        """Write cost (busy_ms per frame includes resize and encode), drops and restarts."""
+        snap = self.stats.snapshot()
+        snap.update(
+            open=self.writer is not None,
+            written=self.written,
+            dropped=self.dropped,
+            paced=self.paced,
+            restarts=self.restarts,
+            failures=self.failures,
+            quality=self.controller.get_stats() if self.controller is not None else None,
+        )
+        return snap
@@ -0,0 +1,147 @@
+"""
+Pipeline stage primitives.
+Latest-value handoffs, per-stage statistics and worker threads used by the
+staged TrackingApp loop.
+"""
+
+import threading
+import time
+from collections import deque
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LatestValue:
+    """
+    Single-slot handoff between stages.
+    Writers never block: a new value replaces the pending one (latest wins)
+    and the replaced value is counted as dropped and passed to on_drop.
+    """
+    def __init__(self, on_drop=None):
+        self.on_drop = on_drop
+        self._cond = threading.Condition()
+        self._value = None
+        self._seq = 0
+        self._taken_seq = 0
+        self.dropped = 0
+
+    def put(self, value):
+        dropped = None
+        with self._cond:
+            if self._seq > self._taken_seq:
+                self.dropped += 1
+                dropped = self._value
+            self._value = value
+            self._seq += 1
+            self._cond.notify_all()
+            seq = self._seq
+        if dropped is not None and self.on_drop is not None:
+            self.on_drop(dropped)
+        return seq
+
+    def get(self, after_seq=0, timeout=None):
+        """
+        Wait for a value newer than after_seq.
+        Returns (seq, value), or (after_seq, None) on timeout.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > after_seq, timeout):
+                return after_seq, None
+            self._taken_seq = self._seq
+            return self._seq, self._value
+
+    def peek(self):
+        """Returns (seq, value) without waiting or marking it taken."""
+        with self._cond:
+            return self._seq, self._value
+
+    @property
+    def seq(self):
+        return self._seq
+
+    @property
+    def pending(self):
+        """True if the current value has not been taken yet."""
+        return self._seq > self._taken_seq
+
+
+class StageStats:
+    """
+    Throughput and latency of one stage over a sliding window.
+    busy_ms is time spent inside the stage, latency_ms is the age of the
+    frame (since it entered the pipeline) when the stage finished with it.
+    """
+    def __init__(self, name, window=60):
+        self.name = name
+        self.lock = threading.Lock()
+        self.done = deque(maxlen=window)
+        self.busy = deque(maxlen=window)
+        self.latency = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, started, frame_ts=None):
+        now = time.monotonic()
+        with self.lock:
+            self.count += 1
+            self.done.append(now)
+            self.busy.append(now - started)
+            if frame_ts is not None:
+                self.latency.append(now - frame_ts)
+
+    def snapshot(self):
+        with self.lock:
+            fps = 0.0
+            if len(self.done) >= 2:
+                span = self.done[-1] - self.done[0]
+                if span > 0:
+                    fps = (len(self.done) - 1) / span
+            busy = sum(self.busy) / len(self.busy) if self.busy else 0.0
+            latency = sum(self.latency) / len(self.latency) if self.latency else 0.0
+            return {
+                "fps": round(fps, 1),
+                "busy_ms": round(busy * 1000, 2),
+                "latency_ms": round(latency * 1000, 2),
+                "count": self.count,
+            }
+
+
+class StageWorker:
+    """
+    Runs fn(value) on its own thread for every new value of source.
+    Values that arrive while fn is busy are dropped in favour of the newest.
+    fn may return the frame timestamp so the stage latency can be recorded.
+    """
+    def __init__(self, name, source, fn, stats=None, poll_timeout=0.5):
+        self.name = name
+        self.source = source
+        self.fn = fn
+        self.poll_timeout = poll_timeout
+        self.stats = stats or StageStats(name)
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name=f"stage-{self.name}", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        seq = 0
+        while self.running:
+            new_seq, value = self.source.get(seq, timeout=self.poll_timeout)
+            if value is None:
+                continue
+            seq = new_seq
+            started = time.monotonic()
+            try:
+                frame_ts = self.fn(value)
+            except Exception as e:
+                logger.error(f"Stage '{self.name}' failed: {e}")
+                continue
+            self.stats.record(started, frame_ts)
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
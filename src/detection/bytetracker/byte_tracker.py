@@ -1,13 +1,29 @@
 import numpy as np
+from collections import OrderedDict
 
 from .kalman_filter import KalmanFilter
 from .matching import Matching
 from .basetrack import BaseTrack, TrackState
+from .track_store import StoreField, TrackStore
 
 class STrack(BaseTrack):
 
     shared_kalman = KalmanFilter()
+
+    # Views onto the tracker's TrackStore row once activated
+    mean = StoreField()
+    covariance = StoreField()
+    state = StoreField(TrackState.New)
+    track_id = StoreField(0)
+    frame_id = StoreField(0)
+    start_frame = StoreField(0)
+    tracklet_len = StoreField(0)
+    score = StoreField(0)
+    is_activated = StoreField(False)
+
     def __init__(self, tlwh, score):
+        self._store = None
+        self._row = None
 
         # wait activate
         self._tlwh = np.asarray(tlwh, dtype=np.float64)
@@ -26,7 +42,10 @@ class STrack(BaseTrack):
 
     @staticmethod
     def multi_predict(stracks):
-        if len(stracks) > 0:
+        store = _shared_store(stracks)
+        if store is not None:
+            store.multi_predict(store.rows(stracks), STrack.shared_kalman)
+        elif len(stracks) > 0:
             multi_mean = np.asarray([st.mean.copy() for st in stracks])
             multi_covariance = np.asarray([st.covariance for st in stracks])
             for i, st in enumerate(stracks):
@@ -37,8 +56,10 @@ class STrack(BaseTrack):
                 stracks[i].mean = mean
                 stracks[i].covariance = cov
 
-    def activate(self, kalman_filter, frame_id):
+    def activate(self, kalman_filter, frame_id, store=None):
         """Start a new tracklet"""
+        if store is not None and self._row is None:
+            store.attach(self)
         self.kalman_filter = kalman_filter
         self.track_id = self.next_id()
         self.mean, self.covariance = self.kalman_filter.initiate(self.tlwh_to_xyah(self._tlwh))
@@ -101,10 +122,18 @@ class STrack(BaseTrack):
         """Convert bounding box to format `(min x, min y, max x, max y)`, i.e.,
         `(top left, bottom right)`.
         """
-        ret = self.tlwh.copy()
+        ret = self.tlwh
         ret[2:] += ret[:2]
         return ret
 
+    @staticmethod
+    def multi_tlbr(stracks):
+        """(N, 4) tlbr boxes of stracks, batched when they share a store."""
+        store = _shared_store(stracks)
+        if store is not None:
+            return store.tlbr(store.rows(stracks))
+        return np.asarray([st.tlbr for st in stracks], dtype=np.float64).reshape(-1, 4)
+
     @staticmethod
     # @jit(nopython=True)
     def tlwh_to_xyah(tlwh):
@@ -137,18 +166,50 @@ class STrack(BaseTrack):
         return 'OT_{}_({}-{})'.format(self.track_id, self.start_frame, self.end_frame)
 
 
+class RemovedTrackHistory(object):
+    """
+    Ids of recently removed tracks. Entries are evicted once they are older
+    than max_age frames or when more than maxlen are held, so memory stays
+    flat over long runs.
+    """
+    def __init__(self, max_age=300, maxlen=1000):
+        self.max_age = max_age
+        self.maxlen = maxlen
+        self._ids = OrderedDict()  # track_id -> frame removed, oldest first
+
+    def add(self, stracks, frame_id):
+        for track in stracks:
+            self._ids[track.track_id] = frame_id
+        self.evict(frame_id)
+
+    def evict(self, frame_id):
+        ids = self._ids
+        while ids and (len(ids) > self.maxlen or frame_id - next(iter(ids.values())) > self.max_age):
+            ids.popitem(last=False)
+
+    def __contains__(self, track_id):
+        return track_id in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+
 class BYTETracker(object):
     def __init__(self, args, frame_rate=30):
         self.tracked_stracks = []  # type: list[STrack]
         self.lost_stracks = []  # type: list[STrack]
-        self.removed_stracks = []  # type: list[STrack]
         self.frame_id = 0
         self.args = args
         #self.det_thresh = args.track_thresh
         self.det_thresh = args.track_thresh + 0.1
         self.buffer_size = int(frame_rate / 30.0 * args.track_buffer)
         self.max_time_lost = self.buffer_size
+        self.removed_track_ids = RemovedTrackHistory(max_age=max(self.max_time_lost, 30))
         self.kalman_filter = KalmanFilter()
+        self.store = TrackStore()
 
     def update(self, output_results):
         self.frame_id += 1
@@ -195,20 +256,12 @@ class BYTETracker(object):
         strack_pool = joint_stracks(tracked_stracks, self.lost_stracks)
         # Predict the current location with KF
         STrack.multi_predict(strack_pool)
-        dists = Matching.iou_distance(strack_pool, detections)
+        dists = Matching.iou_distance(STrack.multi_tlbr(strack_pool), dets)
         if not self.args.mot20:
             dists = Matching.fuse_score(dists, detections)
         matches, u_track, u_detection = Matching.linear_assignment(dists, thresh=self.args.match_thresh)
 
-        for itracked, idet in matches:
-            track = strack_pool[itracked]
-            det = detections[idet]
-            if track.state == TrackState.Tracked:
-                track.update(detections[idet], self.frame_id)
-                activated_starcks.append(track)
-            else:
-                track.re_activate(det, self.frame_id, new_id=False)
-                refind_stracks.append(track)
+        self._update_matched(strack_pool, dets, scores_keep, matches, activated_starcks, refind_stracks)
 
         ''' Step 3: Second association, with low score detection boxes'''
         # association the untrack to the low score detections
@@ -219,17 +272,9 @@ class BYTETracker(object):
         else:
             detections_second = []
         r_tracked_stracks = [strack_pool[i] for i in u_track if strack_pool[i].state == TrackState.Tracked]
-        dists = Matching.iou_distance(r_tracked_stracks, detections_second)
+        dists = Matching.iou_distance(STrack.multi_tlbr(r_tracked_stracks), dets_second)
         matches, u_track, u_detection_second = Matching.linear_assignment(dists, thresh=0.5)
-        for itracked, idet in matches:
-            track = r_tracked_stracks[itracked]
-            det = detections_second[idet]
-            if track.state == TrackState.Tracked:
-                track.update(det, self.frame_id)
-                activated_starcks.append(track)
-            else:
-                track.re_activate(det, self.frame_id, new_id=False)
-                refind_stracks.append(track)
+        self._update_matched(r_tracked_stracks, dets_second, scores_second, matches, activated_starcks, refind_stracks)
 
         for it in u_track:
             track = r_tracked_stracks[it]
@@ -238,14 +283,15 @@ class BYTETracker(object):
                 lost_stracks.append(track)
 
         '''Deal with unconfirmed tracks, usually tracks with only one beginning frame'''
+        u_detection = np.asarray(u_detection, dtype=int)
         detections = [detections[i] for i in u_detection]
-        dists = Matching.iou_distance(unconfirmed, detections)
+        dets, scores_keep = dets[u_detection], scores_keep[u_detection]
+        dists = Matching.iou_distance(STrack.multi_tlbr(unconfirmed), dets)
         if not self.args.mot20:
             dists = Matching.fuse_score(dists, detections)
         matches, u_unconfirmed, u_detection = Matching.linear_assignment(dists, thresh=0.7)
-        for itracked, idet in matches:
-            unconfirmed[itracked].update(detections[idet], self.frame_id)
-            activated_starcks.append(unconfirmed[itracked])
+        # Unconfirmed tracks are in the Tracked state, so all of them land in activated_starcks
+        self._update_matched(unconfirmed, dets, scores_keep, matches, activated_starcks, refind_stracks)
         for it in u_unconfirmed:
             track = unconfirmed[it]
             track.mark_removed()
@@ -256,11 +302,13 @@ class BYTETracker(object):
             track = detections[inew]
             if track.score < self.det_thresh:
                 continue
-            track.activate(self.kalman_filter, self.frame_id)
+            track.activate(self.kalman_filter, self.frame_id, self.store)
             activated_starcks.append(track)
         """ Step 5: Update state"""
-        for track in self.lost_stracks:
-            if self.frame_id - track.end_frame > self.max_time_lost:
+        if self.lost_stracks:
+            frame_ids = self.store.columns['frame_id'][self.store.rows(self.lost_stracks)]
+            for i in np.nonzero(self.frame_id - frame_ids > self.max_time_lost)[0]:
+                track = self.lost_stracks[i]
                 track.mark_removed()
                 removed_stracks.append(track)
 
@@ -271,14 +319,53 @@ class BYTETracker(object):
         self.tracked_stracks = joint_stracks(self.tracked_stracks, refind_stracks)
         self.lost_stracks = sub_stracks(self.lost_stracks, self.tracked_stracks)
         self.lost_stracks.extend(lost_stracks)
-        self.lost_stracks = sub_stracks(self.lost_stracks, self.removed_stracks)
-        self.removed_stracks.extend(removed_stracks)
+        self.lost_stracks = [t for t in self.lost_stracks if t.track_id not in self.removed_track_ids]
+        self.removed_track_ids.add(removed_stracks, self.frame_id)
         self.tracked_stracks, self.lost_stracks = remove_duplicate_stracks(self.tracked_stracks, self.lost_stracks)
+        # Free rows of removed tracks and of tracks dropped as duplicates
+        self.store.detach_except(self.tracked_stracks + self.lost_stracks)
         # get scores of lost tracks
         output_stracks = [track for track in self.tracked_stracks if track.is_activated]
 
         return output_stracks
 
+    def _update_matched(self, tracks, tlbrs, scores, matches, activated_starcks, refind_stracks):
+        """
+        Batched STrack.update / re_activate: one Kalman update for every
+        matched (track, detection) pair of an association round. Tracked
+        tracks continue their tracklet, lost ones are re-activated.
+        """
+        if len(matches) == 0:
+            return
+        matches = np.asarray(matches)
+        matched = [tracks[i] for i in matches[:, 0]]
+        store = self.store
+        rows = store.rows(matched)
+
+        # tlbr -> (center x, center y, aspect ratio, height)
+        boxes = np.asarray(tlbrs, dtype=np.float64)[matches[:, 1]]
+        w = boxes[:, 2] - boxes[:, 0]
+        h = boxes[:, 3] - boxes[:, 1]
+        measurements = np.stack([boxes[:, 0] + w / 2, boxes[:, 1] + h / 2, w / h, h], axis=1)
+
+        mean, covariance = self.kalman_filter.multi_update(store.mean[rows], store.covariance[rows], measurements)
+        store.mean[rows] = mean
+        store.covariance[rows] = covariance
+
+        columns = store.columns
+        tracked = columns['state'][rows] == TrackState.Tracked
+        columns['tracklet_len'][rows] = np.where(tracked, columns['tracklet_len'][rows] + 1, 0)
+        columns['state'][rows] = TrackState.Tracked
+        columns['is_activated'][rows] = True
+        columns['frame_id'][rows] = self.frame_id
+        columns['score'][rows] = np.asarray(scores)[matches[:, 1]]
+
+        for track, was_tracked in zip(matched, tracked):
+            if was_tracked:
+                activated_starcks.append(track)
+            else:
+                refind_stracks.append(track)
+
 
 def joint_stracks(tlista, tlistb):
     exists = {}
@@ -305,8 +392,16 @@ def sub_stracks(tlista, tlistb):
     return list(stracks.values())
 
 
+def _shared_store(stracks):
+    """The TrackStore all stracks are attached to, or None."""
+    store = stracks[0]._store if len(stracks) > 0 else None
+    if store is not None and all(st._store is store for st in stracks):
+        return store
+    return None
+
+
 def remove_duplicate_stracks(stracksa, stracksb):
-    pdist = Matching.iou_distance(stracksa, stracksb)
+    pdist = Matching.iou_distance(STrack.multi_tlbr(stracksa), STrack.multi_tlbr(stracksb))
     pairs = np.where(pdist < 0.15)
     dupa, dupb = list(), list()
     for p, q in zip(*pairs):
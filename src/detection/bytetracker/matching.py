@@ -1,30 +1,86 @@
 import cv2
 import numpy as np
 import scipy
+import scipy.sparse
 import lap
+from scipy.sparse.csgraph import connected_components
 from scipy.spatial.distance import cdist
 
 try:
-    from cython_bbox import bbox_overlaps as bbox_ious
+    import numba
 except (ImportError, ModuleNotFoundError):
-    def bbox_ious(atlbrs, btlbrs):
-        """
-        NumPy-based IoU implementation as fallback for cython_bbox
-        """
-        ious = np.zeros((len(atlbrs), len(btlbrs)), dtype=np.float64)
-        if ious.size == 0:
-            return ious
+    numba = None
+
+
+def _iou_dtype(atlbrs, btlbrs):
+    """float32 if both inputs are float32, float64 otherwise"""
+    dtype = np.result_type(np.asarray(atlbrs), np.asarray(btlbrs))
+    return dtype if dtype in (np.float32, np.float64) else np.dtype(np.float64)
+
 
-        for i, box_a in enumerate(atlbrs):
-            for j, box_b in enumerate(btlbrs):
-                iw = min(box_a[2], box_b[2]) - max(box_a[0], box_b[0])
+def bbox_ious_numpy(atlbrs, btlbrs):
+    """
+    Broadcasted NumPy IoU between Nx4 and Mx4 tlbr boxes, computed as one
+    NxM matrix in the input precision (float32 or float64).
+    """
+    dtype = _iou_dtype(atlbrs, btlbrs)
+    a = np.asarray(atlbrs, dtype=dtype).reshape(-1, 4)
+    b = np.asarray(btlbrs, dtype=dtype).reshape(-1, 4)
+    ious = np.zeros((len(a), len(b)), dtype=dtype)
+    if ious.size == 0:
+        return ious
+
+    iw = np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0])
+    ih = np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1])
+    np.maximum(iw, 0, out=iw)
+    np.maximum(ih, 0, out=ih)
+    inter = iw * ih
+
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    np.divide(inter, union, out=ious, where=inter > 0)
+    return ious
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _bbox_ious_kernel(a, b, ious):
+        for i in range(a.shape[0]):
+            area_a = (a[i, 2] - a[i, 0]) * (a[i, 3] - a[i, 1])
+            for j in range(b.shape[0]):
+                iw = min(a[i, 2], b[j, 2]) - max(a[i, 0], b[j, 0])
                 if iw > 0:
-                    ih = min(box_a[3], box_b[3]) - max(box_a[1], box_b[1])
+                    ih = min(a[i, 3], b[j, 3]) - max(a[i, 1], b[j, 1])
                     if ih > 0:
-                        ua = (box_a[2] - box_a[0]) * (box_a[3] - box_a[1]) + \
-                             (box_b[2] - box_b[0]) * (box_b[3] - box_b[1]) - iw * ih
-                        ious[i, j] = iw * ih / ua
+                        inter = iw * ih
+                        area_b = (b[j, 2] - b[j, 0]) * (b[j, 3] - b[j, 1])
+                        ious[i, j] = inter / (area_a + area_b - inter)
+
+    def bbox_ious_numba(atlbrs, btlbrs):
+        """Numba IoU kernel, same contract as bbox_ious_numpy"""
+        dtype = _iou_dtype(atlbrs, btlbrs)
+        a = np.ascontiguousarray(atlbrs, dtype=dtype).reshape(-1, 4)
+        b = np.ascontiguousarray(btlbrs, dtype=dtype).reshape(-1, 4)
+        ious = np.zeros((len(a), len(b)), dtype=dtype)
+        if ious.size:
+            _bbox_ious_kernel(a, b, ious)
         return ious
+else:
+    bbox_ious_numba = None
+
+
+try:
+    from cython_bbox import bbox_overlaps as bbox_ious
+    IOU_BACKEND = "cython_bbox"
+except (ImportError, ModuleNotFoundError):
+    # cython_bbox is usually missing on ARM boards
+    if bbox_ious_numba is not None:
+        bbox_ious = bbox_ious_numba
+        IOU_BACKEND = "numba"
+    else:
+        bbox_ious = bbox_ious_numpy
+        IOU_BACKEND = "numpy"
 
 from .kalman_filter import chi2inv95
 import time
@@ -32,6 +88,12 @@ import time
 
 class Matching:
 
+    # Above this many track x detection pairs, IoU is only computed for
+    # pairs found by sweep-and-prune
+    gate_min_pairs = 1024
+    # Above this many pairs, assignment is split into connected components
+    split_min_pairs = 64
+
     @staticmethod
     def merge_matches(m1, m2, shape):
         O,P,Q = shape
@@ -64,6 +126,9 @@ class Matching:
     def linear_assignment(cost_matrix, thresh):
         if cost_matrix.size == 0:
             return np.empty((0, 2), dtype=int), tuple(range(cost_matrix.shape[0])), tuple(range(cost_matrix.shape[1]))
+        # With thresh >= 1 even non-overlapping pairs are admissible, nothing to split
+        if thresh < 1 and cost_matrix.size >= Matching.split_min_pairs:
+            return Matching.component_assignment(cost_matrix, thresh)
         matches, unmatched_a, unmatched_b = [], [], []
         cost, x, y = lap.lapjv(cost_matrix, extend_cost=True, cost_limit=thresh)
         for ix, mx in enumerate(x):
@@ -74,6 +139,100 @@ class Matching:
         matches = np.asarray(matches)
         return matches, unmatched_a, unmatched_b
 
+    @staticmethod
+    def component_assignment(cost_matrix, thresh):
+        """
+        Same result as linear_assignment, solved per connected component.
+
+        Pairs costing more than thresh can never be matched, so tracks and
+        detections only interact through admissible pairs. Each connected
+        component of that bipartite graph is an independent small
+        assignment problem, single pairs are matched without a solver.
+        """
+        n, m = cost_matrix.shape
+        rows, cols = np.nonzero(cost_matrix <= thresh)
+        if len(rows) == 0:
+            return np.empty((0, 2), dtype=int), np.arange(n), np.arange(m)
+
+        graph = scipy.sparse.coo_matrix((np.ones(len(rows)), (rows, n + cols)), shape=(n + m, n + m))
+        num, labels = connected_components(graph, directed=False)
+        row_labels, col_labels = labels[:n], labels[n:]
+        row_groups = np.split(np.argsort(row_labels, kind='stable'),
+                              np.cumsum(np.bincount(row_labels, minlength=num))[:-1])
+        col_groups = np.split(np.argsort(col_labels, kind='stable'),
+                              np.cumsum(np.bincount(col_labels, minlength=num))[:-1])
+
+        matches = []
+        for label in np.unique(row_labels[rows]):
+            r, c = row_groups[label], col_groups[label]
+            if len(r) == 1 and len(c) == 1:
+                matches.append((r[0], c[0]))
+                continue
+            _, x, _ = lap.lapjv(cost_matrix[np.ix_(r, c)], extend_cost=True, cost_limit=thresh)
+            for i, j in enumerate(x):
+                if j >= 0:
+                    matches.append((r[i], c[j]))
+
+        matches = np.asarray(matches, dtype=int).reshape(-1, 2)
+        matched_a = np.zeros(n, dtype=bool)
+        matched_b = np.zeros(m, dtype=bool)
+        matched_a[matches[:, 0]] = True
+        matched_b[matches[:, 1]] = True
+        return matches, np.nonzero(~matched_a)[0], np.nonzero(~matched_b)[0]
+
+    @staticmethod
+    def candidate_pairs(atlbrs, btlbrs):
+        """
+        Index arrays (ia, ib) of all box pairs that overlap, by sweep-and-prune.
+
+        b is sorted by xmin. A box b can only overlap a if it starts before a
+        ends and starts no earlier than a.xmin - (widest b), so each a only
+        tests that slice, which holds the boxes near it rather than all of b.
+        """
+        a = np.asarray(atlbrs, dtype=np.float64).reshape(-1, 4)
+        b = np.asarray(btlbrs, dtype=np.float64).reshape(-1, 4)
+        if len(a) == 0 or len(b) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        order = np.argsort(b[:, 0], kind='stable')
+        bx1 = b[order, 0]
+        max_w = np.max(b[:, 2] - b[:, 0])
+        lo = np.searchsorted(bx1, a[:, 0] - max_w, side='left')
+        hi = np.searchsorted(bx1, a[:, 2], side='left')
+        counts = np.maximum(hi - lo, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        # Flatten the per-a slices [lo, hi) into pair arrays
+        ia = np.repeat(np.arange(len(a)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        ib = order[np.repeat(lo, counts) + offsets]
+
+        overlap = (b[ib, 2] > a[ia, 0]) & (b[ib, 1] < a[ia, 3]) & (b[ib, 3] > a[ia, 1])
+        return ia[overlap], ib[overlap]
+
+    @staticmethod
+    def sparse_ious(atlbrs, btlbrs):
+        """Dense IoU matrix, computed only for the pairs that overlap."""
+        a = np.asarray(atlbrs, dtype=np.float64).reshape(-1, 4)
+        b = np.asarray(btlbrs, dtype=np.float64).reshape(-1, 4)
+        ious = np.zeros((len(a), len(b)), dtype=np.float64)
+        if IOU_BACKEND == "cython_bbox":
+            # Same IoU as the dense path: cython_bbox sizes boxes as x2 - x1 + 1
+            a = a + [0, 0, 1, 1]
+            b = b + [0, 0, 1, 1]
+        ia, ib = Matching.candidate_pairs(a, b)
+        if len(ia) == 0:
+            return ious
+        pa, pb = a[ia], b[ib]
+        iw = np.minimum(pa[:, 2], pb[:, 2]) - np.maximum(pa[:, 0], pb[:, 0])
+        ih = np.minimum(pa[:, 3], pb[:, 3]) - np.maximum(pa[:, 1], pb[:, 1])
+        inter = iw * ih
+        union = (pa[:, 2] - pa[:, 0]) * (pa[:, 3] - pa[:, 1]) + (pb[:, 2] - pb[:, 0]) * (pb[:, 3] - pb[:, 1]) - inter
+        ious[ia, ib] = inter / union
+        return ious
+
     @staticmethod
     def ious(atlbrs, btlbrs):
         """
@@ -87,12 +246,17 @@ class Matching:
         if ious.size == 0:
             return ious
 
-        ious = bbox_ious(
-            np.ascontiguousarray(atlbrs, dtype=np.float64),
-            np.ascontiguousarray(btlbrs, dtype=np.float64)
-        )
+        if len(atlbrs) * len(btlbrs) >= Matching.gate_min_pairs:
+            return Matching.sparse_ious(atlbrs, btlbrs)
 
-        return ious
+        if IOU_BACKEND == "cython_bbox":
+            # cython_bbox only takes float64
+            return bbox_ious(
+                np.ascontiguousarray(atlbrs, dtype=np.float64),
+                np.ascontiguousarray(btlbrs, dtype=np.float64)
+            )
+
+        return bbox_ious(np.asarray(atlbrs), np.asarray(btlbrs))
 
     @staticmethod
     def iou_distance(atracks, btracks):
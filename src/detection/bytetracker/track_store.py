@@ -0,0 +1,153 @@
+import numpy as np
+
+from .basetrack import TrackState
+
+
+class StoreField(object):
+    """
+    Track attribute that lives in the track's TrackStore row while the track
+    is attached, and in the instance dict before activation and after
+    removal.
+    """
+
+    def __init__(self, default=None):
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.attr = '_f_' + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        row = obj._row
+        if row is None:
+            return obj.__dict__.get(self.attr, self.default)
+        value = obj._store.columns[self.name][row]
+        # Keep array rows as views, hand out plain Python scalars otherwise
+        return value if isinstance(value, np.ndarray) else value.item()
+
+    def __set__(self, obj, value):
+        row = obj._row
+        if row is None:
+            obj.__dict__[self.attr] = value
+        else:
+            obj._store.columns[self.name][row] = value
+
+
+class TrackStore(object):
+    """
+    Structure-of-arrays storage for live tracks.
+
+    Every attached track owns one row of contiguous arrays (Nx8 means,
+    Nx8x8 covariances, states, ids, frame counters, scores), so prediction,
+    box conversion and bookkeeping run as batched array operations over row
+    indices. Rows are recycled through a free list and the arrays grow by
+    doubling.
+    """
+
+    COLUMNS = {
+        'mean': ((8,), np.float64),
+        'covariance': ((8, 8), np.float64),
+        'state': ((), np.int8),
+        'track_id': ((), np.int64),
+        'frame_id': ((), np.int64),
+        'start_frame': ((), np.int64),
+        'tracklet_len': ((), np.int64),
+        'score': ((), np.float64),
+        'is_activated': ((), np.bool_),
+    }
+
+    def __init__(self, capacity=64):
+        self.capacity = 0
+        self.columns = {name: np.zeros((0,) + shape, dtype=dtype)
+                        for name, (shape, dtype) in self.COLUMNS.items()}
+        self.in_use = np.zeros(0, dtype=bool)
+        self.owners = []
+        self._free = []
+        self._grow(capacity)
+
+    @property
+    def mean(self):
+        return self.columns['mean']
+
+    @property
+    def covariance(self):
+        return self.columns['covariance']
+
+    def __len__(self):
+        return self.capacity - len(self._free)
+
+    def _grow(self, capacity):
+        old = self.capacity
+        for name, (shape, dtype) in self.COLUMNS.items():
+            column = np.zeros((capacity,) + shape, dtype=dtype)
+            column[:old] = self.columns[name]
+            self.columns[name] = column
+        in_use = np.zeros(capacity, dtype=bool)
+        in_use[:old] = self.in_use
+        self.in_use = in_use
+        self.owners.extend([None] * (capacity - old))
+        # Hand out low rows first
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def attach(self, track):
+        """Gives track a row and moves its stored attributes into it."""
+        if not self._free:
+            self._grow(max(2 * self.capacity, 8))
+        row = self._free.pop()
+        fields = {name: track.__dict__.pop('_f_' + name, None) for name in self.COLUMNS}
+        track._store, track._row = self, row
+        self.in_use[row] = True
+        self.owners[row] = track
+        for name, value in fields.items():
+            self.columns[name][row] = value if value is not None else 0
+        return row
+
+    def detach(self, track):
+        """Copies the track's row back into the track and frees the row."""
+        row = track._row
+        if row is None:
+            return
+        values = {name: self.columns[name][row].copy() for name in self.COLUMNS}
+        track._row, track._store = None, None
+        for name, value in values.items():
+            track.__dict__['_f_' + name] = value if value.ndim else value.item()
+        self.in_use[row] = False
+        self.owners[row] = None
+        self._free.append(row)
+
+    def detach_except(self, tracks):
+        """Detaches every attached track that is not in tracks (removed or dropped as a duplicate)."""
+        keep = np.zeros(self.capacity, dtype=bool)
+        keep[self.rows(tracks)] = True
+        for row in np.nonzero(self.in_use & ~keep)[0]:
+            self.detach(self.owners[row])
+
+    @staticmethod
+    def rows(tracks):
+        return np.fromiter((t._row for t in tracks), dtype=np.intp, count=len(tracks))
+
+    def tlwh(self, rows):
+        """(N, 4) boxes as (top left x, top left y, width, height)."""
+        ret = self.columns['mean'][rows, :4]
+        ret[:, 2] *= ret[:, 3]
+        ret[:, :2] -= ret[:, 2:] / 2
+        return ret
+
+    def tlbr(self, rows):
+        """(N, 4) boxes as (min x, min y, max x, max y)."""
+        ret = self.tlwh(rows)
+        ret[:, 2:] += ret[:, :2]
+        return ret
+
+    def multi_predict(self, rows, kalman_filter):
+        """Kalman prediction of the given rows in one batched call."""
+        if len(rows) == 0:
+            return
+        mean = self.columns['mean'][rows]
+        mean[self.columns['state'][rows] != TrackState.Tracked, 7] = 0
+        mean, covariance = kalman_filter.multi_predict(mean, self.columns['covariance'][rows])
+        self.columns['mean'][rows] = mean
+        self.columns['covariance'][rows] = covariance
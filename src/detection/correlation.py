@@ -0,0 +1,126 @@
+"""
+Template Correlation Engines
+Normalized cross-correlation (cv2.TM_CCOEFF_NORMED) in the spatial or the
+frequency domain
+"""
+
+import cv2
+import numpy as np
+from typing import Dict, Hashable, Tuple
+
+
+ENGINES = ("auto", "spatial", "fft")
+
+
+def match_spatial(image: np.ndarray, templates: Dict[Hashable, np.ndarray]) -> Dict[Hashable, np.ndarray]:
+    """cv2.matchTemplate for every template that fits inside image."""
+    results = {}
+    for key, template in templates.items():
+        th, tw = template.shape[:2]
+        if tw <= image.shape[1] and th <= image.shape[0]:
+            results[key] = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+    return results
+
+
+def select_engine(engine: str, template_area: int, fft_min_area: int) -> str:
+    """
+    Resolve 'auto' to 'fft' for templates of at least fft_min_area and
+    'spatial' for smaller ones. cv2.matchTemplate already correlates large
+    templates through a DFT, so fft mostly saves the template transforms
+    and is not faster for every size: measure the crossover with
+    benchmarks/bench_matching.py before relying on 'auto'.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Invalid match engine: {engine}. Must be one of {list(ENGINES)}")
+    if engine == "auto":
+        return "fft" if template_area >= fft_min_area else "spatial"
+    return engine
+
+
+class FFTMatcher:
+    """
+    TM_CCOEFF_NORMED computed in the frequency domain.
+
+    The search window is transformed once and correlated against every
+    template by a spectrum product, the per-window mean and energy come from
+    integral images. Template spectra are cached per template key and DFT
+    size until invalidate() is called, so they are computed once per
+    template update rather than once per frame. Padded input buffers are
+    kept per DFT size, which search windows clipped at the frame edges share.
+    """
+
+    def __init__(self, eps: float = 1e-6) -> None:
+        self.eps = eps
+        # (dft_h, dft_w) -> padded input buffer
+        self._buffers: Dict[Tuple[int, int], np.ndarray] = {}
+        # (key, dft_h, dft_w) -> (spectrum, template norm)
+        self._spectra: Dict[tuple, Tuple[np.ndarray, float]] = {}
+
+    def invalidate(self) -> None:
+        """Drop cached template spectra, call after the templates change."""
+        self._spectra.clear()
+
+    def _spectrum(self, key: Hashable, template: np.ndarray, dft_h: int, dft_w: int) -> Tuple[np.ndarray, float]:
+        entry = self._spectra.get((key, dft_h, dft_w))
+        if entry is None:
+            th, tw = template.shape[:2]
+            zero_mean = template.astype(np.float32)
+            zero_mean -= zero_mean.mean()
+            padded = np.zeros((dft_h, dft_w), dtype=np.float32)
+            padded[:th, :tw] = zero_mean
+            spectrum = cv2.dft(padded, nonzeroRows=th)
+            entry = (spectrum, float(np.sqrt(np.sum(zero_mean * zero_mean))))
+            self._spectra[(key, dft_h, dft_w)] = entry
+        return entry
+
+    def match(self, image: np.ndarray, templates: Dict[Hashable, np.ndarray]) -> Dict[Hashable, np.ndarray]:
+        """
+        Correlate a single-channel image with every template that fits inside it.
+
+        Args:
+            image: Search window (H, W), uint8 or float32.
+            templates: Templates keyed by a stable id (e.g. their scale).
+
+        Returns:
+            Dict of key -> (H - th + 1, W - tw + 1) float32 score maps, the
+            same layout as cv2.matchTemplate.
+        """
+        h, w = image.shape[:2]
+        fitting = {k: t for k, t in templates.items() if t.shape[0] <= h and t.shape[1] <= w}
+        if not fitting:
+            return {}
+
+        dft_h, dft_w = cv2.getOptimalDFTSize(h), cv2.getOptimalDFTSize(w)
+        buf = self._buffers.get((dft_h, dft_w))
+        if buf is None:
+            buf = np.zeros((dft_h, dft_w), dtype=np.float32)
+            self._buffers[(dft_h, dft_w)] = buf
+        else:
+            # A larger window may have used this buffer, clear its padding
+            buf[h:, :] = 0
+            buf[:h, w:] = 0
+        buf[:h, :w] = image
+        image_spectrum = cv2.dft(buf, nonzeroRows=h)
+
+        sums, sq_sums = cv2.integral2(image, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+
+        results = {}
+        for key, template in fitting.items():
+            th, tw = template.shape[:2]
+            spectrum, template_norm = self._spectrum(key, template, dft_h, dft_w)
+            rh, rw = h - th + 1, w - tw + 1
+
+            # With a zero-mean template the window mean cancels out of the numerator
+            product = cv2.mulSpectrums(image_spectrum, spectrum, 0, conjB=True)
+            numerator = cv2.idft(product, flags=cv2.DFT_SCALE | cv2.DFT_REAL_OUTPUT)[:rh, :rw]
+
+            window_sum = sums[th:, tw:] - sums[:-th, tw:] - sums[th:, :-tw] + sums[:-th, :-tw]
+            window_sq = sq_sums[th:, tw:] - sq_sums[:-th, tw:] - sq_sums[th:, :-tw] + sq_sums[:-th, :-tw]
+            variance = window_sq - window_sum * window_sum / (th * tw)
+            denominator = np.sqrt(np.maximum(variance, 0.0)) * template_norm
+
+            result = np.zeros((rh, rw), dtype=np.float32)
+            np.divide(numerator, denominator, out=result, where=denominator > self.eps, casting="unsafe")
+            np.clip(result, -1.0, 1.0, out=result)
+            results[key] = result
+        return results
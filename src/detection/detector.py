@@ -3,6 +3,7 @@ import os
 import numpy as np
 import time
 import queue
+import threading
 from functools import partial
 from src.core.config import cfg
 from src.utils.logger import get_logger
@@ -10,7 +11,8 @@ try:
     from .hailo_inference import HailoInfer
 except (ImportError, ModuleNotFoundError):
     HailoInfer = None
-from .postprocess import extract_detections
+from .postprocess import DetectionPostprocessor
+from .preprocess import Letterboxer
 
 logger = get_logger(__name__)
 
@@ -28,7 +30,18 @@ class HailoDetector:
         
         self.hailo_infer = None
         self.input_shape = None
-        self.queue = queue.Queue(maxsize=1)
+        self.letterboxer = None
+        
+        # Async inference: up to max_in_flight frames queued on the NPU,
+        # completed results wait in self.results until poll_results().
+        # With pooled bindings a frame counts as in flight until
+        # poll_results() has released its binding
+        self.max_in_flight = cfg.get("detection.max_in_flight", 2)
+        self.results = queue.Queue()
+        self.in_flight = 0
+        self.in_flight_lock = threading.Lock()
+        self.skipped = 0 # Frames refused because max_in_flight was reached
+        self._stash = []
         
         self.config_data = {
              "labels": self.labels,
@@ -39,11 +52,25 @@ class HailoDetector:
              },
              "target_classes": cfg.get("detection.target_classes")
         }
+        self.postprocessor = DetectionPostprocessor(
+            self.labels,
+            self.config_data["target_classes"],
+            score_threshold=self.conf_threshold,
+            max_boxes=self.config_data["visualization_params"]["max_boxes_to_draw"],
+        )
 
         try:
             logger.info(f"Initializing Hailo Detector with model: {self.model_path}")
-            self.hailo_infer = HailoInfer(self.model_path)
+            self.hailo_infer = HailoInfer(
+                self.model_path,
+                pool_size=self.max_in_flight,
+                reuse_bindings=cfg.get("detection.reuse_bindings", True),
+            )
             self.input_shape = self.hailo_infer.get_input_shape()
+            model_h, model_w, _ = self.input_shape
+            self.letterboxer = Letterboxer(
+                model_w, model_h, interpolation=cfg.get("detection.interpolation", "linear")
+            )
             logger.info(f"Hailo Initialized. Input shape: {self.input_shape}")
         except Exception as e:
             logger.error(f"Failed to initialize Hailo: {e}")
@@ -58,30 +85,27 @@ class HailoDetector:
             logger.warning(f"Labels file not found: {path}")
             return ["object"] * 100
 
-    def preprocess(self, image):
+    def preprocess(self, image, out=None):
         """
         Resize image with unchanged aspect ratio using padding.
+        Writes into out (e.g. a pooled input buffer) when given.
         """
-        model_h, model_w, _ = self.input_shape
-        img_h, img_w, _ = image.shape[:3]
-        scale = min(model_w / img_w, model_h / img_h)
-        new_img_w, new_img_h = int(img_w * scale), int(img_h * scale)
-        image_resized = cv2.resize(image, (new_img_w, new_img_h), interpolation=cv2.INTER_CUBIC)
-
-        padded_image = np.full((model_h, model_w, 3), (114, 114, 114), dtype=np.uint8)
-        x_offset = (model_w - new_img_w) // 2
-        y_offset = (model_h - new_img_h) // 2
-        padded_image[y_offset : y_offset + new_img_h, x_offset : x_offset + new_img_w] = image_resized
-
-        return padded_image
+        return self.letterboxer(image, out=out)
 
-    def _callback(self, completion_info, bindings_list, output_queue):
+    def _callback(self, completion_info, bindings_list, output_queue, frame_seq, frame, pooled=None):
         """
         Callback from HailoInfer.
+        Runs on the HailoRT thread, so only hands the raw output over. A
+        pooled binding stays in flight until the output has been
+        postprocessed and the binding is released.
         """
+        if pooled is None:
+            with self.in_flight_lock:
+                self.in_flight -= 1
+
         if completion_info.exception:
             print(f"[ERROR] Inference error: {completion_info.exception}")
-            output_queue.put(None)
+            output_queue.put((frame_seq, frame, None, pooled))
         else:
             # We assume batch size 1
             for i, bindings in enumerate(bindings_list):
@@ -92,40 +116,101 @@ class HailoDetector:
                          name: np.expand_dims(bindings.output(name).get_buffer(), axis=0)
                          for name in bindings._output_names
                      }
-                 output_queue.put(result)
+                 output_queue.put((frame_seq, frame, result, pooled))
+
+    def has_capacity(self):
+        return self.in_flight < self.max_in_flight
+
+    def detect_async(self, frame, frame_seq):
+        """
+        Preprocesses frame and queues it on the NPU without waiting.
+        Returns False if detection is unavailable or max_in_flight frames
+        are already queued (the frame is skipped).
+        The result is returned later by poll_results(), tagged with frame_seq.
+        """
+        if not self.enabled or self.hailo_infer is None:
+            return False
+
+        with self.in_flight_lock:
+            if self.in_flight >= self.max_in_flight:
+                self.skipped += 1
+                return False
+            self.in_flight += 1
+
+        pooled = None
+        try:
+            # Only the frame shape is used by postprocessing
+            cb = partial(self._callback, output_queue=self.results, frame_seq=frame_seq, frame=frame)
+            if self.hailo_infer.reuse_bindings:
+                # max_in_flight matches the pool size, so this does not wait
+                pooled = self.hailo_infer.acquire(timeout=1.0)
+                self.preprocess(frame, out=pooled.input_buffer)
+                self.hailo_infer.run_pooled([pooled], partial(cb, pooled=pooled), release=False)
+            else:
+                self.hailo_infer.run([self.preprocess(frame)], cb)
+        except Exception as e:
+            logger.error(f"Hailo Run Failed: {e}")
+            if pooled is not None:
+                self.hailo_infer.release(pooled)
+            with self.in_flight_lock:
+                self.in_flight -= 1
+            return False
+        return True
+
+    def poll_results(self, timeout=0.0):
+        """
+        Returns [(frame_seq, detections), ...] for every inference completed
+        since the last call, oldest first.
+        Waits up to timeout seconds for the first result if none is ready.
+        """
+        completed = self._stash
+        self._stash = []
+        try:
+            if not completed and timeout:
+                completed.append(self.results.get(timeout=timeout))
+            while True:
+                completed.append(self.results.get_nowait())
+        except queue.Empty:
+            pass
+
+        return [(item[0], self._finish(item)) for item in completed]
+
+    def _finish(self, item):
+        """Postprocesses a completed inference and recycles its binding."""
+        _, frame, raw, pooled = item
+        try:
+            return self._postprocess(frame, raw)
+        finally:
+            if pooled is not None:
+                self.hailo_infer.release(pooled)
+                with self.in_flight_lock:
+                    self.in_flight -= 1
 
     def detect(self, frame):
         """
         Synchonous detection wrapper.
         """
-        if not self.enabled or self.hailo_infer is None:
+        if not self.detect_async(frame, None):
             return []
 
-        try:
-            # 1. Preprocess
-            processed = self.preprocess(frame)
-            
-            # 2. Run Inference
-            # Define callback specifically for this run
-            cb = partial(self._callback, output_queue=self.queue)
-            
+        # Wait for this frame's result, keep results of earlier async calls
+        deadline = time.monotonic() + 1.0 # 1 sec timeout
+        while True:
             try:
-                self.hailo_infer.run([processed], cb)
-            except Exception as e:
-                 logger.error(f"Hailo Run Failed: {e}")
-                 return []
-            
-            # 3. Wait for result
-            try:
-                raw_results = self.queue.get(timeout=1.0) # 1 sec timeout
+                item = self.results.get(timeout=max(deadline - time.monotonic(), 0.001))
             except queue.Empty:
                 logger.warning("Inference timed out.")
                 return []
-            
-            if raw_results is None:
-                return []
+            if item[0] is None:
+                return self._finish(item)
+            self._stash.append(item)
+
+    def _postprocess(self, frame, raw_results):
+        """Converts raw model output to [(label, conf, (x,y,w,h))]."""
+        if raw_results is None:
+            return []
 
-            # 4. Postprocess
+        try:
             detections_input = []
             
             if isinstance(raw_results, list):
@@ -143,37 +228,32 @@ class HailoDetector:
 
             # Try to catch the specific postprocess error
             try:
-                results = extract_detections(frame, detections_input, self.config_data)
+                img_h, img_w = frame.shape[:2]
+                results = self.postprocessor(detections_input, self.letterboxer.geometry(img_w, img_h))
             except Exception as e:
-                logger.error(f"extract_detections failed: {e}")
+                logger.error(f"Postprocessing failed: {e}")
                 return []
 
             # Convert to our format: [(label, conf, (x,y,w,h))]
-            detections = []
-            boxes = results.get("detection_boxes", [])
-            scores = results.get("detection_scores", [])
-            classes = results.get("detection_classes", [])
-            
-            for i in range(len(boxes)):
-                box = boxes[i] # [xmin, ymin, xmax, ymax]
-                score = scores[i]
-                class_id = int(classes[i])
-                
-                label = self.labels[class_id] if class_id < len(self.labels) else f"Class {class_id}"
-                
-                x = int(box[0])
-                y = int(box[1])
-                w = int(box[2] - box[0])
-                h = int(box[3] - box[1])
-                
-                detections.append((label, score, (x, y, w, h)))
-                
-            return detections
+            boxes = results["box"].astype(int) # [xmin, ymin, xmax, ymax]
+            boxes[:, 2:] -= boxes[:, :2]
+            return [
+                (self.postprocessor.label(class_id), score, tuple(box))
+                for class_id, score, box in zip(
+                    results["class_id"].tolist(), results["score"].tolist(), boxes.tolist()
+                )
+            ]
             
         except Exception as e:
             print(f"[ERROR] Detection Loop Error: {e}")
             return []
 
+    def get_stats(self):
+        stats = {"in_flight": self.in_flight, "skipped": self.skipped}
+        if self.hailo_infer is not None:
+            stats.update(self.hailo_infer.get_stats())
+        return stats
+
     def close(self):
         if self.hailo_infer:
             self.hailo_infer.close()
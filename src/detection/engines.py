@@ -0,0 +1,252 @@
+"""
+Tracker Engines
+Interchangeable single-target trackers behind ObjectTracker, selected by
+tracking.tracker_type
+"""
+
+import types
+import cv2
+import numpy as np
+
+from src.core.config import cfg
+from src.core.stages import LatestValue
+from src.detection.tracker import HybridTracker
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+ENGINES = {}
+
+
+def register_engine(name):
+    """Class decorator adding an engine to the registry under name."""
+    def decorator(cls):
+        cls.name = name
+        ENGINES[name] = cls
+        return cls
+    return decorator
+
+
+class EngineResources:
+    """
+    Settings and heavy objects shared by all engine instances of one
+    ObjectTracker, so switching engines does not reload models.
+    """
+    def __init__(self):
+        # HybridTracker keyword options (recovery search and matching engine)
+        self.hybrid_options = {
+            "search_mode": cfg.get("tracking.recovery.search_mode", "pyramid"),
+            "pyramid_level": cfg.get("tracking.recovery.pyramid_level", 2),
+            "top_k": cfg.get("tracking.recovery.top_k", 3),
+            "time_budget_ms": cfg.get("tracking.recovery.time_budget_ms", 8),
+            "tile_size": cfg.get("tracking.recovery.tile_size", 160),
+            "match_engine": cfg.get("tracking.match_engine", "spatial"),
+            "fft_min_area": cfg.get("tracking.fft_min_area", 4096),
+        }
+        self.onnx_options = cfg.get("tracking.onnx", {}) or {}
+        self.byte_options = {
+            "track_thresh": 0.5,
+            "track_buffer": 30,
+            "match_thresh": 0.8,
+            "mot20": False,
+        }
+        self.byte_options.update(cfg.get("tracking.bytetracker", {}) or {})
+        self.frame_rate = cfg.get("camera.fps", 30)
+        self._onnx_models = None
+
+    @property
+    def onnx_models(self):
+        """NanoTrack ONNX networks, loaded on first use."""
+        if self._onnx_models is None:
+            from src.detection.nanotrack_onnx import load_models
+            self._onnx_models = load_models(self.onnx_options)
+        return self._onnx_models
+
+
+class TrackerEngine:
+    """
+    Common engine interface.
+
+    update() returns (box, status, confidence), where box is (x, y, w, h)
+    and status is LOCK / TRACK / RECOV while the target is held or SEARCH
+    while it is not.
+    """
+    name = None
+    needs_detections = False  # Detector keeps running while this engine tracks
+    velocity = None  # Target motion (dx, dy) in px/frame, if the engine estimates it
+
+    def __init__(self, frame, bbox, resources):
+        raise NotImplementedError
+
+    def update(self, frame, ctx=None):
+        raise NotImplementedError
+
+    def feed_detections(self, seq, detections):
+        """New detector output for engines that track on detections."""
+        pass
+
+    def reacquire(self, frame, boxes, ctx=None, min_score=0.55):
+        """
+        Re-seed on the candidate box that best matches the lost target.
+        Returns the new box, or None if no candidate matches or the engine
+        cannot validate candidates.
+        """
+        return None
+
+
+@register_engine("NANO")
+class NanoEngine(TrackerEngine):
+    """Template NanoTracker with signature validation and recovery search"""
+    def __init__(self, frame, bbox, resources):
+        self.tracker = HybridTracker(frame, bbox, **resources.hybrid_options)
+
+    def update(self, frame, ctx=None):
+        return self.tracker.update(frame, ctx)
+
+    def reacquire(self, frame, boxes, ctx=None, min_score=0.55):
+        return self.tracker.reacquire(frame, boxes, ctx, min_score)
+
+    @property
+    def velocity(self):
+        return self.tracker.velocity
+
+
+@register_engine("NANO_ONNX")
+class OnnxNanoEngine(TrackerEngine):
+    """Siamese NanoTrack ONNX models on CPU"""
+    def __init__(self, frame, bbox, resources):
+        from src.detection.nanotrack_onnx import OnnxNanoTracker
+        self.tracker = OnnxNanoTracker(frame, bbox, resources.onnx_models)
+
+    def update(self, frame, ctx=None):
+        return self.tracker.update(frame, ctx)
+
+
+def _opencv_factory(factory_name):
+    """Tracker constructor from cv2 or cv2.legacy (contrib builds), or None."""
+    for module in (cv2, getattr(cv2, "legacy", None)):
+        create = getattr(module, factory_name, None) if module is not None else None
+        if create is not None:
+            return create
+    return None
+
+
+class OpenCVEngine(TrackerEngine):
+    """OpenCV single-object tracker, no confidence output"""
+    factory_name = None
+
+    def __init__(self, frame, bbox, resources):
+        create = _opencv_factory(self.factory_name)
+        if create is None:
+            raise RuntimeError(f"{self.name} tracker not available in this OpenCV build (needs opencv-contrib-python)")
+        self.tracker = create()
+        self.last_box = tuple(int(v) for v in bbox)
+        self.tracker.init(frame, self.last_box)
+
+    def update(self, frame, ctx=None):
+        ok, box = self.tracker.update(frame)
+        if ok:
+            self.last_box = tuple(box)
+            return self.last_box, "TRACK", 1.0
+        return self.last_box, "SEARCH", 0.0
+
+
+@register_engine("CSRT")
+class CSRTEngine(OpenCVEngine):
+    factory_name = "TrackerCSRT_create"
+
+
+@register_engine("KCF")
+class KCFEngine(OpenCVEngine):
+    factory_name = "TrackerKCF_create"
+
+
+@register_engine("MOSSE")
+class MOSSEEngine(OpenCVEngine):
+    factory_name = "TrackerMOSSE_create"
+
+
+def _iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = min(ax + aw, bx + bw) - max(ax, bx)
+    ih = min(ay + ah, by + bh) - max(ay, by)
+    if iw <= 0 or ih <= 0:
+        return 0.0
+    inter = iw * ih
+    return inter / (aw * ah + bw * bh - inter)
+
+
+@register_engine("BYTE")
+class ByteEngine(TrackerEngine):
+    """
+    ByteTrack on detector output. The target is the track that overlaps the
+    selected box, and is re-associated by overlap if its track id is lost.
+    Between detector results the last state is held.
+    """
+    needs_detections = True
+
+    def __init__(self, frame, bbox, resources, min_iou=0.3):
+        from src.detection.bytetracker.byte_tracker import BYTETracker
+        self.tracker = BYTETracker(types.SimpleNamespace(**resources.byte_options), frame_rate=resources.frame_rate)
+        self.min_iou = min_iou
+        self.target_id = None
+        self.pending = LatestValue()
+        self.taken_seq = 0
+        self.frame_seq = None  # Frame sequence number of the last detector result
+        self.result = (tuple(bbox), "SEARCH", 0.0)
+
+    def feed_detections(self, seq, detections):
+        self.pending.put((seq, detections))
+
+    def update(self, frame, ctx=None):
+        self.taken_seq, item = self.pending.get(self.taken_seq, timeout=0)
+        if item is None:
+            return self.result
+        seq, detections = item
+        # Frames between this detector result and the previous one
+        frames = seq - self.frame_seq if seq is not None and self.frame_seq is not None else 1
+        self.frame_seq = seq
+
+        dets = np.array(
+            [(x, y, x + w, y + h, score) for _, score, (x, y, w, h) in detections], dtype=np.float64
+        ).reshape(-1, 5)
+        tracks = self.tracker.update(dets)
+
+        target = next((t for t in tracks if t.track_id == self.target_id), None)
+        if target is None:
+            last_box = self.result[0]
+            best_iou = self.min_iou
+            for track in tracks:
+                iou = _iou(last_box, track.tlwh)
+                if iou > best_iou:
+                    best_iou, target = iou, track
+            if target is not None:
+                self.target_id = target.track_id
+
+        if target is None:
+            self.velocity = None
+            self.result = (self.result[0], "SEARCH", 0.0)
+        else:
+            # Kalman centre velocity is per detector update, scale it to px/frame
+            self.velocity = target.mean[4:6] / max(frames, 1)
+            self.result = (tuple(float(v) for v in target.tlwh), "TRACK", float(target.score))
+        return self.result
+
+
+def create_engine(name, frame, bbox, resources, fallback="NANO"):
+    """
+    Build the engine registered as name. If it cannot be created (unknown
+    name, missing OpenCV contrib or ONNX models) falls back to the fallback
+    engine so tracking still starts.
+    """
+    try:
+        if name not in ENGINES:
+            raise ValueError(f"Unknown tracker engine: {name}. Must be one of {list(ENGINES)}")
+        return ENGINES[name](frame, bbox, resources)
+    except (ValueError, RuntimeError, FileNotFoundError, cv2.error) as e:
+        if fallback is None or name == fallback:
+            raise
+        logger.error(f"Tracker engine {name} unavailable ({e}), falling back to {fallback}")
+        return ENGINES[fallback](frame, bbox, resources)
@@ -3,6 +3,9 @@ Hailo Inference Engine
 Wrapper for Hailo device inference
 """
 
+import time
+import queue
+import threading
 import numpy as np
 from typing import List, Tuple, Optional, Dict
 from functools import partial
@@ -20,6 +23,17 @@ except (ImportError, ModuleNotFoundError):
     FormatOrder = None
 
 
+class PooledBinding:
+    """Preconfigured bindings with fixed input and output buffers, reused across frames."""
+
+    __slots__ = ("bindings", "input_buffer", "output_buffers")
+
+    def __init__(self, bindings, input_buffer: np.ndarray, output_buffers: Dict[str, np.ndarray]) -> None:
+        self.bindings = bindings
+        self.input_buffer = input_buffer
+        self.output_buffers = output_buffers
+
+
 class HailoInfer:
     """Hailo asynchronous inference wrapper."""
 
@@ -30,6 +44,8 @@ class HailoInfer:
         input_type: Optional[str] = None,
         output_type: Optional[str] = None,
         priority: Optional[int] = 0,
+        pool_size: int = 4,
+        reuse_bindings: bool = False,
     ) -> None:
         """
         Initialize the HailoAsyncInference class.
@@ -40,6 +56,12 @@ class HailoInfer:
             input_type: Input data type format ('UINT8', 'UINT16', 'FLOAT32').
             output_type: Output data type format.
             priority: Scheduler priority value.
+            pool_size: Number of preallocated bindings (max frames in flight),
+                at least batch_size.
+            reuse_bindings: Recycle pooled bindings instead of allocating
+                new buffers and bindings for every frame. Output buffers
+                passed to run() callbacks are then reused by later frames,
+                see run().
         """
         if not HAS_HAILO:
             raise RuntimeError("Hailo library (hailo_platform) not installed. Please install it to use Hailo hardware acceleration.")
@@ -65,10 +87,24 @@ class HailoInfer:
         self.configured_model.set_scheduler_priority(priority)
         self.last_infer_job = None
 
+        self.reuse_bindings = reuse_bindings
+        self.stats_lock = threading.Lock()
+        self.buffer_allocations = 0
+        self.bindings_created = 0
+        self.completed = 0
+        self.latency_ms = 0.0
+
+        self.pool = queue.Queue()
+        if reuse_bindings:
+            for _ in range(max(pool_size, batch_size)):
+                self.pool.put(self._create_pooled_binding())
+
     def _set_input_type(self, input_type: Optional[str] = None) -> None:
         """Set the input type for the HEF model."""
+        self.input_dtype = np.uint8
         if input_type is not None:
             self.infer_model.input().set_format_type(getattr(FormatType, input_type))
+            self.input_dtype = getattr(np, input_type.lower())
 
     def _set_output_type(self, output_type: Optional[str] = None) -> None:
         """Set the output type for each model output."""
@@ -91,29 +127,118 @@ class HailoInfer:
         """Get the shape of the model's input layer."""
         return self.hef.get_input_vstream_infos()[0].shape
 
+    def _create_output_buffers(self) -> Dict[str, np.ndarray]:
+        """Allocate one buffer per output layer."""
+        self.buffer_allocations += len(self.output_type)
+        return {
+            name: np.empty(
+                self.infer_model.output(name).shape,
+                dtype=(getattr(np, self.output_type[name].lower())),
+            )
+            for name in self.output_type
+        }
+
+    def _create_pooled_binding(self) -> PooledBinding:
+        """Create bindings whose input buffer is written in place for every frame."""
+        output_buffers = self._create_output_buffers()
+        input_buffer = np.empty(self.get_input_shape(), dtype=self.input_dtype)
+        self.buffer_allocations += 1
+
+        bindings = self.configured_model.create_bindings(output_buffers=output_buffers)
+        bindings.input().set_buffer(input_buffer)
+        self.bindings_created += 1
+        return PooledBinding(bindings, input_buffer, output_buffers)
+
+    def acquire(self, timeout: Optional[float] = 10.0) -> PooledBinding:
+        """
+        Take a free pooled binding. Write the preprocessed frame into its
+        input_buffer, then submit it with run_pooled().
+        """
+        return self.pool.get(timeout=timeout)
+
+    def release(self, pooled: PooledBinding) -> None:
+        """Return a pooled binding once its outputs are no longer needed."""
+        self.pool.put(pooled)
+
     def run(self, input_batch: List[np.ndarray], inference_callback_fn) -> object:
-        """Run an asynchronous inference job on a batch of preprocessed inputs."""
-        bindings_list = self.create_bindings(self.configured_model, input_batch)
+        """
+        Run an asynchronous inference job on a batch of preprocessed inputs.
+
+        With reuse_bindings the bindings return to the pool when the
+        callback returns, so output buffers are only valid inside the
+        callback: copy them (or use acquire()/run_pooled(release=False))
+        to keep them longer.
+        """
+        if not self.reuse_bindings:
+            bindings_list = self.create_bindings(self.configured_model, input_batch)
+            self._submit(bindings_list, partial(inference_callback_fn, bindings_list=bindings_list))
+            return
+
+        pooled = [self.acquire() for _ in input_batch]
+        for slot, frame in zip(pooled, input_batch):
+            slot.input_buffer[...] = frame
+        self.run_pooled(pooled, inference_callback_fn, release=True)
+
+    def run_pooled(self, pooled: List[PooledBinding], inference_callback_fn, release: bool = True) -> None:
+        """
+        Run an asynchronous inference job on pooled bindings.
+
+        Args:
+            pooled: Bindings from acquire() with their input buffers filled.
+            inference_callback_fn: Called as fn(completion_info, bindings_list=...).
+            release: Return the bindings to the pool after the callback. Pass
+                False to keep the output buffers alive and call release() later.
+        """
+        bindings_list = [slot.bindings for slot in pooled]
+
+        def on_done(completion_info):
+            try:
+                inference_callback_fn(completion_info, bindings_list=bindings_list)
+            finally:
+                if release:
+                    for slot in pooled:
+                        self.release(slot)
+
+        self._submit(bindings_list, on_done)
+
+    def _submit(self, bindings_list, callback_fn) -> None:
         self.configured_model.wait_for_async_ready(timeout_ms=10000)
+        submitted = time.perf_counter()
+
+        def on_done(completion_info):
+            self._record_latency(time.perf_counter() - submitted)
+            callback_fn(completion_info)
+
+        self.last_infer_job = self.configured_model.run_async(bindings_list, on_done)
 
-        self.last_infer_job = self.configured_model.run_async(
-            bindings_list, partial(inference_callback_fn, bindings_list=bindings_list)
-        )
+    def _record_latency(self, elapsed: float) -> None:
+        with self.stats_lock:
+            self.completed += 1
+            # Exponential moving average of submit -> completion time
+            self.latency_ms += (elapsed * 1000.0 - self.latency_ms) * 0.1
+
+    def get_stats(self) -> Dict[str, float]:
+        """Allocation counters and average inference latency."""
+        with self.stats_lock:
+            return {
+                "reuse_bindings": self.reuse_bindings,
+                "buffer_allocations": self.buffer_allocations,
+                "bindings_created": self.bindings_created,
+                "completed": self.completed,
+                "latency_ms": round(self.latency_ms, 2),
+                "free_bindings": self.pool.qsize(),
+            }
 
     def create_bindings(self, configured_model, input_batch):
         """Create a list of input-output bindings for a batch of frames."""
 
         def frame_binding(frame: np.ndarray):
-            output_buffers = {
-                name: np.empty(
-                    self.infer_model.output(name).shape,
-                    dtype=(getattr(np, self.output_type[name].lower())),
-                )
-                for name in self.output_type
-            }
+            output_buffers = self._create_output_buffers()
 
             binding = configured_model.create_bindings(output_buffers=output_buffers)
             binding.input().set_buffer(np.array(frame))
+            self.buffer_allocations += 1
+            self.bindings_created += 1
             return binding
 
         return [frame_binding(frame) for frame in input_batch]
@@ -0,0 +1,243 @@
+"""
+NanoTrack Siamese Tracker
+Runs the NanoTrackV2 backbone/head ONNX models on CPU with cv2.dnn or
+onnxruntime, following the SiamTrackers reference tracker
+"""
+
+import os
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+
+BACKENDS = ("opencv", "onnxruntime")
+
+
+class NanoTrackModels:
+    """
+    Backbone and head networks, loaded once and shared by every tracker
+    instance.
+
+    backbone: input (1, 3, S, S) BGR float32 -> output feature map
+    head:     input1 = template features, input2 = search features
+              -> output1 = classification (1, 2, N, N), output2 = box regression (1, 4, N, N)
+    """
+
+    def __init__(
+        self,
+        backbone_path: str = "models/nanotrack_backbone.onnx",
+        head_path: str = "models/nanotrack_head.onnx",
+        backend: str = "opencv",
+        threads: int = 2,
+    ) -> None:
+        """
+        Args:
+            backbone_path: Backbone ONNX model.
+            head_path: Head ONNX model.
+            backend: 'opencv' (cv2.dnn) or 'onnxruntime'.
+            threads: CPU threads for inference. cv2.dnn only has a process-wide
+                setting, onnxruntime applies it per session.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Invalid backend: {backend}. Must be one of {list(BACKENDS)}")
+        if backend == "onnxruntime" and not ONNXRUNTIME_AVAILABLE:
+            logger.warning("onnxruntime not installed, falling back to cv2.dnn")
+            backend = "opencv"
+
+        for path in (backbone_path, head_path):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"NanoTrack model not found: {path} (run download_models.py)")
+
+        self.backend = backend
+        self.threads = threads
+
+        if backend == "onnxruntime":
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+            providers = ["CPUExecutionProvider"]
+            self._backbone = ort.InferenceSession(backbone_path, options, providers=providers)
+            self._head = ort.InferenceSession(head_path, options, providers=providers)
+            self._backbone_input = self._backbone.get_inputs()[0].name
+        else:
+            if threads:
+                cv2.setNumThreads(threads)
+            self._backbone = cv2.dnn.readNet(backbone_path)
+            self._head = cv2.dnn.readNet(head_path)
+            for net in (self._backbone, self._head):
+                net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+                net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+
+        logger.info(f"NanoTrack ONNX models loaded ({backend}, {threads} threads)")
+
+    def embed(self, blob: np.ndarray) -> np.ndarray:
+        """Backbone features of one (1, 3, S, S) crop."""
+        if self.backend == "onnxruntime":
+            return self._backbone.run(None, {self._backbone_input: blob})[0]
+        self._backbone.setInput(blob)
+        # Copy, cv2.dnn may reuse its output memory on the next forward
+        return self._backbone.forward().copy()
+
+    def head(self, template_features: np.ndarray, search_features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Classification and regression maps for one search crop."""
+        if self.backend == "onnxruntime":
+            cls, reg = self._head.run(["output1", "output2"], {"input1": template_features, "input2": search_features})
+            return cls, reg
+        self._head.setInput(template_features, "input1")
+        self._head.setInput(search_features, "input2")
+        cls, reg = self._head.forward(["output1", "output2"])
+        return cls, reg
+
+
+class OnnxNanoTracker:
+    """
+    Siamese NanoTrack tracker. The template embedding is computed once at
+    init and reused for every frame, each update runs the backbone on the
+    search crop plus the head.
+
+    update() returns (box, status, score) like HybridTracker.
+    """
+    exemplar_size = 127
+    instance_size = 255
+    stride = 16
+    context_amount = 0.5
+    penalty_k = 0.148
+    window_influence = 0.455
+    lr = 0.37
+
+    def __init__(self, frame, bbox, models: NanoTrackModels, track_thresh=0.3, lock_thresh=0.6):
+        self.models = models
+        self.track_thresh = track_thresh
+        self.lock_thresh = lock_thresh
+
+        x, y, w, h = [float(v) for v in bbox]
+        self.center = np.array([x + w / 2, y + h / 2], dtype=np.float32)
+        self.size = np.array([w, h], dtype=np.float32)
+        self.channel_average = cv2.mean(frame)[:3]
+
+        crop = self._crop(frame, self.exemplar_size, round(self._context_size()))
+        self.template_features = models.embed(cv2.dnn.blobFromImage(crop))
+
+        self._score_size = None
+        self.score = 1.0
+        self.lost_frames = 0
+        self.last_box = (x, y, w, h)
+
+    def _context_size(self) -> float:
+        w, h = self.size
+        pad = self.context_amount * (w + h)
+        return float(np.sqrt((w + pad) * (h + pad)))
+
+    def _crop(self, frame, model_size, original_size):
+        """Square crop around the target centre resized to model_size, padded with the mean colour."""
+        c = (original_size + 1) / 2
+        xmin = np.floor(self.center[0] - c + 0.5)
+        ymin = np.floor(self.center[1] - c + 0.5)
+        s = model_size / original_size
+        # One warp does crop, padding and resize without copying the frame
+        m = np.array([[s, 0, -xmin * s], [0, s, -ymin * s]], dtype=np.float32)
+        return cv2.warpAffine(
+            frame, m, (model_size, model_size),
+            flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=self.channel_average,
+        )
+
+    def _prepare_grid(self, score_size):
+        self._score_size = score_size
+        origin = -(score_size // 2) * self.stride
+        xs = origin + self.stride * np.arange(score_size, dtype=np.float32)
+        grid_x, grid_y = np.meshgrid(xs, xs)
+        self.points = np.stack([grid_x.ravel(), grid_y.ravel()], axis=1)
+        self.window = np.outer(np.hanning(score_size), np.hanning(score_size)).ravel().astype(np.float32)
+
+    def update(self, frame, ctx=None):
+        context = self._context_size()
+        scale_z = self.exemplar_size / context
+        search_size = round(context * self.instance_size / self.exemplar_size)
+
+        crop = self._crop(frame, self.instance_size, search_size)
+        search_features = self.models.embed(cv2.dnn.blobFromImage(crop))
+        cls, reg = self.models.head(self.template_features, search_features)
+
+        score_size = cls.shape[-1]
+        if score_size != self._score_size:
+            self._prepare_grid(score_size)
+
+        # Foreground probability (softmax over the 2 classes)
+        logits = cls.reshape(2, -1)
+        score = 1.0 / (1.0 + np.exp(logits[0] - logits[1]))
+
+        # Distances to the box edges -> centre/size in search crop pixels
+        delta = reg.reshape(4, -1)
+        x1 = self.points[:, 0] - delta[0]
+        y1 = self.points[:, 1] - delta[1]
+        x2 = self.points[:, 0] + delta[2]
+        y2 = self.points[:, 1] + delta[3]
+        pred_cx, pred_cy = (x1 + x2) / 2, (y1 + y2) / 2
+        pred_w, pred_h = x2 - x1, y2 - y1
+
+        # Scale and aspect ratio change penalties
+        def change(r):
+            return np.maximum(r, 1.0 / r)
+
+        def padded_size(w, h):
+            pad = (w + h) * 0.5
+            return np.sqrt((w + pad) * (h + pad))
+
+        target_w, target_h = self.size * scale_z
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s_c = change(padded_size(pred_w, pred_h) / padded_size(target_w, target_h))
+            r_c = change((target_w / target_h) / (pred_w / pred_h))
+        penalty = np.exp(-(r_c * s_c - 1) * self.penalty_k)
+        pscore = penalty * score
+        pscore = np.nan_to_num(pscore) * (1 - self.window_influence) + self.window * self.window_influence
+
+        best = int(np.argmax(pscore))
+        self.score = float(score[best])
+
+        if self.score < self.track_thresh:
+            self.lost_frames += 1
+            return self.last_box, "SEARCH", self.score
+
+        lr = penalty[best] * score[best] * self.lr
+        cx = self.center[0] + pred_cx[best] / scale_z
+        cy = self.center[1] + pred_cy[best] / scale_z
+        w = self.size[0] * (1 - lr) + pred_w[best] / scale_z * lr
+        h = self.size[1] * (1 - lr) + pred_h[best] / scale_z * lr
+
+        fh, fw = frame.shape[:2]
+        cx, cy = min(max(cx, 0), fw), min(max(cy, 0), fh)
+        w, h = min(max(w, 10), fw), min(max(h, 10), fh)
+
+        self.center[:] = (cx, cy)
+        self.size[:] = (w, h)
+        self.lost_frames = 0
+        self.last_box = (float(cx - w / 2), float(cy - h / 2), float(w), float(h))
+
+        status = "LOCK" if self.score >= self.lock_thresh else "TRACK"
+        return self.last_box, status, self.score
+
+
+def load_models(options: Optional[dict] = None) -> NanoTrackModels:
+    """Build NanoTrackModels from tracking.onnx style options, resolving relative paths."""
+    from src.utils.paths import get_external_path
+
+    options = options or {}
+    paths = []
+    for key, default in (("backbone", "models/nanotrack_backbone.onnx"), ("head", "models/nanotrack_head.onnx")):
+        path = options.get(key, default)
+        paths.append(path if os.path.isabs(path) else get_external_path(path))
+    return NanoTrackModels(
+        paths[0], paths[1],
+        backend=options.get("backend", "opencv"),
+        threads=options.get("threads", 2),
+    )
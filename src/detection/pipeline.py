@@ -14,6 +14,7 @@ from functools import partial
 from ..camera import CameraFactory, VideoInput, ImageInput
 from .hailo_inference import HailoInfer
 from .postprocess import extract_detections
+from .preprocess import Letterboxer
 from .visualize import visualize, draw_detections
 from ..config import DEFAULT_CONFIG
 from ..tracker import ManualObjectTracker
@@ -21,6 +22,9 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Letterboxers (cached geometry) per model input size
+_letterboxers = {}
+
 
 def default_preprocess(image: np.ndarray, model_w: int, model_h: int) -> np.ndarray:
     """
@@ -34,19 +38,13 @@ def default_preprocess(image: np.ndarray, model_w: int, model_h: int) -> np.ndar
     Returns:
         Preprocessed and padded image.
     """
-    img_h, img_w, _ = image.shape[:3]
-    scale = min(model_w / img_w, model_h / img_h)
-    new_img_w, new_img_h = int(img_w * scale), int(img_h * scale)
-    image = cv2.resize(image, (new_img_w, new_img_h), interpolation=cv2.INTER_CUBIC)
-
-    padded_image = np.full((model_h, model_w, 3), (114, 114, 114), dtype=np.uint8)
-    x_offset = (model_w - new_img_w) // 2
-    y_offset = (model_h - new_img_h) // 2
-    padded_image[y_offset : y_offset + new_img_h, x_offset : x_offset + new_img_w] = (
-        image
-    )
+    letterboxer = _letterboxers.get((model_w, model_h))
+    if letterboxer is None:
+        letterboxer = Letterboxer(model_w, model_h)
+        _letterboxers[(model_w, model_h)] = letterboxer
 
-    return padded_image
+    # Results are queued, so each one needs its own buffer
+    return letterboxer(image, out=np.empty((model_h, model_w, 3), dtype=np.uint8))
 
 
 def divide_list_to_batches(images_list: List[np.ndarray], batch_size: int):
@@ -146,7 +144,9 @@ def infer(
     input_queue: queue.Queue,
     output_queue: queue.Queue,
     detection_skip_frames: int = 0,
-    enable_tracking: bool = False
+    enable_tracking: bool = False,
+    scheduler=None,
+    tracker_state=None,
 ):
     """
     Main inference loop with optional frame skipping for tracking optimization.
@@ -157,6 +157,11 @@ def infer(
         output_queue: Queue collecting (input_frame, result) tuples.
         detection_skip_frames: Number of frames to skip between detections when tracking (default: 0).
         enable_tracking: Whether tracking is enabled.
+        scheduler: Optional DetectionScheduler replacing the fixed skip when tracking,
+                   backs off while the output queue is full.
+        tracker_state: Optional callable returning (confidence, speed in px/frame) of the
+                   tracked target for the scheduler, without it the scheduler assumes
+                   an unsure target and only backs off on queue depth.
     """
     frame_counter = 0
 
@@ -168,9 +173,19 @@ def infer(
         input_batch, preprocessed_batch = next_batch
 
         # Frame skipping optimization: only run detection every Nth frame when tracking
-        if enable_tracking and detection_skip_frames > 0:
-            # Run detection on first frame and every (skip_frames + 1)th frame
-            should_detect = (frame_counter % (detection_skip_frames + 1)) == 0
+        if enable_tracking and (detection_skip_frames > 0 or scheduler is not None):
+            if scheduler is not None:
+                confidence, speed = tracker_state() if tracker_state is not None else (0.0, 0.0)
+                should_detect = scheduler.should_detect(
+                    frame_seq=frame_counter,
+                    confidence=confidence,
+                    speed=speed,
+                    queue_depth=output_queue.qsize(),
+                    queue_capacity=output_queue.maxsize or 1,
+                )
+            else:
+                # Run detection on first frame and every (skip_frames + 1)th frame
+                should_detect = (frame_counter % (detection_skip_frames + 1)) == 0
 
             if should_detect:
                 # Run full inference
@@ -4,7 +4,17 @@ Detection extraction and coordinate transformation
 """
 
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from .preprocess import LetterboxGeometry
+
+
+# One row per detection: box is [xmin, ymin, xmax, ymax] in source image pixels
+DETECTION_DTYPE = np.dtype([
+    ("box", np.float32, (4,)),
+    ("score", np.float32),
+    ("class_id", np.int32),
+])
 
 
 def denormalize_and_rm_pad(
@@ -47,6 +57,96 @@ def denormalize_and_rm_pad(
     return [box[1], box[0], box[3], box[2]]
 
 
+class DetectionPostprocessor:
+    """
+    Vectorized conversion of per-class NMS output to a structured array.
+
+    Built once from the labels and target classes, so the class filter is
+    not rebuilt every frame. All per-box work (score threshold, padding
+    removal, coordinate swap, top-k) is done with array operations.
+    """
+
+    def __init__(
+        self,
+        labels: List[str],
+        target_classes: Optional[List[str]] = None,
+        score_threshold: float = 0.25,
+        max_boxes: int = 500,
+    ) -> None:
+        """
+        Args:
+            labels: Class labels, indexed by class id.
+            target_classes: Optional class names to keep, all classes if empty.
+            score_threshold: Minimum detection score.
+            max_boxes: Maximum number of detections returned.
+        """
+        self.labels = labels
+        self.score_threshold = score_threshold
+        self.max_boxes = max_boxes
+
+        self.target_class_ids = None
+        if target_classes:
+            index = {label.lower(): idx for idx, label in reversed(list(enumerate(labels)))}
+            self.target_class_ids = sorted(
+                index[name.lower()] for name in target_classes if name.lower() in index
+            )
+
+    def __call__(self, detections: list, geometry: LetterboxGeometry) -> np.ndarray:
+        """
+        Args:
+            detections: Per-class NMS output, detections[class_id] is an
+                (N, 5) array of [ymin, xmin, ymax, xmax, score] normalized to
+                the model input.
+            geometry: Letterbox geometry the frame was preprocessed with.
+
+        Returns:
+            Structured array of DETECTION_DTYPE, sorted by descending score.
+        """
+        class_ids = self.target_class_ids
+        if class_ids is None:
+            class_ids = range(len(detections))
+
+        rows, ids = [], []
+        for class_id in class_ids:
+            if class_id >= len(detections):
+                break
+            det = np.asarray(detections[class_id], dtype=np.float32)
+            if det.size == 0 or det.shape[-1] < 5:
+                continue
+            det = det.reshape(-1, det.shape[-1])[:, :5]
+            rows.append(det)
+            ids.append(np.full(len(det), class_id, dtype=np.int32))
+
+        if not rows:
+            return np.empty(0, dtype=DETECTION_DTYPE)
+
+        rows = np.concatenate(rows)
+        ids = np.concatenate(ids)
+
+        keep = rows[:, 4] >= self.score_threshold
+        rows, ids = rows[keep], ids[keep]
+
+        # Top-k by score, then sort only the survivors
+        if len(rows) > self.max_boxes:
+            top = np.argpartition(-rows[:, 4], self.max_boxes - 1)[: self.max_boxes]
+            rows, ids = rows[top], ids[top]
+        order = np.argsort(-rows[:, 4], kind="stable")
+        rows, ids = rows[order], ids[order]
+
+        result = np.empty(len(rows), dtype=DETECTION_DTYPE)
+        result["box"] = geometry.normalized_to_source(rows[:, :4])
+        result["score"] = rows[:, 4]
+        result["class_id"] = ids
+        return result
+
+    def label(self, class_id: int) -> str:
+        return self.labels[class_id] if class_id < len(self.labels) else f"Class {class_id}"
+
+
+# Postprocessors built by extract_detections, keyed by their settings
+_postprocessors: Dict[tuple, DetectionPostprocessor] = {}
+
+
 def extract_detections(image: np.ndarray, detections: list, config_data: dict) -> dict:
     """
     Extract detections from the raw model output.
@@ -66,67 +166,34 @@ def extract_detections(image: np.ndarray, detections: list, config_data: dict) -
     labels = config_data.get("labels", [])
     target_classes = config_data.get("target_classes", None)
 
-    # Build target class IDs if target_classes is specified
-    target_class_ids = None
-    if target_classes and len(target_classes) > 0:
-        target_class_ids = set()
-        for class_name in target_classes:
-            # Find class_id for this class_name
-            for idx, label in enumerate(labels):
-                if label.lower() == class_name.lower():
-                    target_class_ids.add(idx)
-                    break
+    key = (tuple(labels), tuple(target_classes or ()), score_threshold, max_boxes)
+    postprocessor = _postprocessors.get(key)
+    if postprocessor is None:
+        postprocessor = DetectionPostprocessor(labels, target_classes, score_threshold, max_boxes)
+        _postprocessors[key] = postprocessor
 
+    # Legacy layout: square model input padded along the shorter side
     img_height, img_width = image.shape[:2]
     size = max(img_height, img_width)
-    padding_length = int(abs(img_height - img_width) / 2)
-
-    all_detections = []
+    result = postprocessor(detections, LetterboxGeometry(img_width, img_height, size, size))
 
-    for class_id, detection in enumerate(detections):
-        # Skip this class if target_classes is specified and this class is not in it
-        if target_class_ids is not None and class_id not in target_class_ids:
-            continue
-
-        # Skip empty detection arrays
-        if isinstance(detection, np.ndarray) and detection.size == 0:
-            continue
-
-        for det in detection:
-            # Ensure det has at least 5 elements (4 bbox coords + 1 score)
-            if len(det) < 5:
-                continue
-            bbox, score = det[:4], det[4]
-            if score >= score_threshold:
-                denorm_bbox = denormalize_and_rm_pad(
-                    bbox, size, padding_length, img_height, img_width
-                )
-                all_detections.append((score, class_id, denorm_bbox))
-
-    # Sort by score descending
-    all_detections.sort(reverse=True, key=lambda x: x[0])
-
-    # Take top max_boxes
-    top_detections = all_detections[:max_boxes]
-
-    scores, class_ids, boxes = zip(*top_detections) if top_detections else ([], [], [])
+    boxes = result["box"].astype(int).tolist()
+    class_ids = result["class_id"].tolist()
+    scores = result["score"].tolist()
 
     # Print bounding boxes in original image coordinates
-    if print_boxes and top_detections:
-        labels = config_data.get("labels", [])
+    if print_boxes and len(result):
         print(f"\n{'='*80}")
         print(f"Image Resolution: {img_width}x{img_height}")
-        print(f"Detections: {len(top_detections)}")
+        print(f"Detections: {len(result)}")
         print(f"{'='*80}")
-        for idx, (score, class_id, box) in enumerate(top_detections):
+        for idx, (score, class_id, box) in enumerate(zip(scores, class_ids, boxes)):
             # box is [xmin, ymin, xmax, ymax]
             xmin, ymin, xmax, ymax = box[0], box[1], box[2], box[3]
 
             width = xmax - xmin
             height = ymax - ymin
-            class_name = (
-                labels[class_id] if class_id < len(labels) else f"Class_{class_id}"
-            )
+            class_name = postprocessor.label(class_id)
             print(f"Detection {idx+1}:")
             print(f"  Class: {class_name} (ID: {class_id})")
             print(f"  Confidence: {score*100:.2f}%")
@@ -135,8 +202,8 @@ def extract_detections(image: np.ndarray, detections: list, config_data: dict) -
             print()
 
     return {
-        "detection_boxes": list(boxes),
-        "detection_classes": list(class_ids),
-        "detection_scores": list(scores),
-        "num_detections": len(top_detections),
+        "detection_boxes": boxes,
+        "detection_classes": class_ids,
+        "detection_scores": scores,
+        "num_detections": len(result),
     }
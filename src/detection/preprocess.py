@@ -0,0 +1,159 @@
+"""
+Pre-processing Functions
+Letterbox resize into the model input with cached geometry
+"""
+
+import weakref
+import cv2
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+
+INTERPOLATIONS = {
+    "nearest": cv2.INTER_NEAREST,
+    "linear": cv2.INTER_LINEAR,
+    "area": cv2.INTER_AREA,
+    "cubic": cv2.INTER_CUBIC,
+}
+
+
+class LetterboxGeometry:
+    """
+    Scale and padding that map a source image into the model input.
+
+    source -> model:  x_model = x_src * scale + pad_x
+    model -> source:  x_src = (x_model - pad_x) / scale
+    """
+
+    def __init__(self, src_w: int, src_h: int, model_w: int, model_h: int) -> None:
+        self.src_w, self.src_h = src_w, src_h
+        self.model_w, self.model_h = model_w, model_h
+        self.scale = min(model_w / src_w, model_h / src_h)
+        self.new_w, self.new_h = int(src_w * self.scale), int(src_h * self.scale)
+        self.pad_x = (model_w - self.new_w) // 2
+        self.pad_y = (model_h - self.new_h) // 2
+
+    def to_source(self, boxes: np.ndarray) -> np.ndarray:
+        """
+        Map [xmin, ymin, xmax, ymax] boxes in model pixels back to the source
+        image, clipped to its bounds.
+
+        Args:
+            boxes: (N, 4) array of boxes in model input pixels.
+
+        Returns:
+            (N, 4) float32 array of boxes in source image pixels.
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        out = np.empty_like(boxes)
+        out[:, 0::2] = (boxes[:, 0::2] - self.pad_x) / self.scale
+        out[:, 1::2] = (boxes[:, 1::2] - self.pad_y) / self.scale
+        np.clip(out[:, 0::2], 0, self.src_w, out=out[:, 0::2])
+        np.clip(out[:, 1::2], 0, self.src_h, out=out[:, 1::2])
+        return out
+
+    def normalized_to_source(self, boxes: np.ndarray) -> np.ndarray:
+        """
+        Map normalized [ymin, xmin, ymax, xmax] boxes (Hailo NMS output order)
+        to [xmin, ymin, xmax, ymax] in source image pixels.
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        model_px = np.empty_like(boxes)
+        model_px[:, 0] = boxes[:, 1] * self.model_w
+        model_px[:, 1] = boxes[:, 0] * self.model_h
+        model_px[:, 2] = boxes[:, 3] * self.model_w
+        model_px[:, 3] = boxes[:, 2] * self.model_h
+        return self.to_source(model_px)
+
+
+class Letterboxer:
+    """
+    Resize images into the model input with unchanged aspect ratio.
+
+    Geometry is computed once per source resolution. The padded output buffer
+    is kept between calls and its border is painted only once, each frame is
+    resized straight into the interior view.
+    """
+
+    def __init__(
+        self,
+        model_w: int,
+        model_h: int,
+        interpolation: str = "linear",
+        pad_value: int = 114,
+    ) -> None:
+        """
+        Args:
+            model_w: Model input width.
+            model_h: Model input height.
+            interpolation: One of 'nearest', 'linear', 'area', 'cubic'.
+            pad_value: Gray level of the padding border.
+        """
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(
+                f"Invalid interpolation: {interpolation}. Must be one of {list(INTERPOLATIONS)}"
+            )
+        self.model_w, self.model_h = model_w, model_h
+        self.interpolation = INTERPOLATIONS[interpolation]
+        self.pad_value = pad_value
+        self._geometry: Dict[Tuple[int, int], LetterboxGeometry] = {}
+        self._buffer: Optional[np.ndarray] = None
+        # id(buffer) -> (weakref to buffer, geometry it was painted for)
+        self._painted: Dict[int, tuple] = {}
+
+    def geometry(self, src_w: int, src_h: int) -> LetterboxGeometry:
+        """Cached geometry for one source resolution."""
+        key = (src_w, src_h)
+        geometry = self._geometry.get(key)
+        if geometry is None:
+            geometry = LetterboxGeometry(src_w, src_h, self.model_w, self.model_h)
+            self._geometry[key] = geometry
+        return geometry
+
+    def __call__(self, image: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Letterbox image into out (or the internal buffer).
+
+        Args:
+            image: Source image (H, W, 3).
+            out: Optional (model_h, model_w, 3) uint8 buffer to write into,
+                e.g. a pooled inference input buffer.
+
+        Returns:
+            The padded model input. The internal buffer is reused by the next
+            call, so pass out= if the result has to outlive it.
+        """
+        src_h, src_w = image.shape[:2]
+        geometry = self.geometry(src_w, src_h)
+
+        if out is None:
+            if self._buffer is None:
+                self._buffer = np.empty((self.model_h, self.model_w, 3), dtype=np.uint8)
+            out = self._buffer
+
+        self._paint_border(out, geometry)
+
+        interior = out[
+            geometry.pad_y : geometry.pad_y + geometry.new_h,
+            geometry.pad_x : geometry.pad_x + geometry.new_w,
+        ]
+        if geometry.new_w == src_w and geometry.new_h == src_h:
+            interior[...] = image
+        else:
+            resized = cv2.resize(
+                image, (geometry.new_w, geometry.new_h), dst=interior, interpolation=self.interpolation
+            )
+            if not np.may_share_memory(resized, interior):
+                interior[...] = resized
+        return out
+
+    def _paint_border(self, out: np.ndarray, geometry: LetterboxGeometry) -> None:
+        """Fill out with the pad value unless it is already padded for this geometry."""
+        entry = self._painted.get(id(out))
+        if entry is not None and entry[0]() is out and entry[1] is geometry:
+            return
+        out[...] = self.pad_value
+        if len(self._painted) > 32:
+            # Forget buffers that no longer exist
+            self._painted = {k: v for k, v in self._painted.items() if v[0]() is not None}
+        self._painted[id(out)] = (weakref.ref(out), geometry)
@@ -0,0 +1,109 @@
+"""
+Detection Scheduler
+Adaptive detector duty cycle: inference runs often while the tracker is
+unsure or the target moves fast, rarely while it holds a slow target, and
+backs off when the NPU queue fills up
+"""
+
+import math
+import threading
+
+
+class DetectionScheduler:
+    """
+    Decides per frame whether to queue the frame on the detector.
+
+    The interval (frames between detections) goes from max_interval for a
+    confident, slow target down to min_interval when the tracker confidence
+    drops to confidence_low or the target speed reaches speed_ref px/frame.
+    The interval is stretched by the NPU queue fill ratio, and no frame is
+    queued while the queue is full. Elapsed frames are counted from frame
+    sequence numbers, so frames the caller never offers still count.
+
+    Frames marked required (the tracker itself runs on detections) are
+    queued every min_interval frames whatever the confidence, speed and
+    queue fill, only a full queue holds them back.
+    """
+    def __init__(self, enabled=True, min_interval=1, max_interval=10,
+                 confidence_low=0.4, confidence_high=0.8, speed_ref=20.0, smoothing=0.05):
+        self.enabled = enabled
+        self.min_interval = max(1, int(min_interval))
+        self.max_interval = max(self.min_interval, int(max_interval))
+        self.confidence_low = confidence_low
+        self.confidence_high = max(confidence_high, confidence_low + 1e-6)
+        self.speed_ref = speed_ref
+        self.smoothing = smoothing  # EMA weight of the duty cycle
+
+        self.lock = threading.Lock()
+        self.interval = self.min_interval
+        self.duty_cycle = 1.0  # Fraction of offered frames sent to the detector
+        self.last_seq = None  # Sequence number of the last frame sent, None = send the next one
+        self._calls = 0  # Stands in for the sequence number when the caller has none
+        self.requested = 0  # Frames sent to the detector
+        self.skipped = 0  # Frames not sent because the interval had not elapsed
+        self.backpressure = 0  # Frames not sent because the NPU queue was full
+
+    def _need(self, confidence, speed):
+        """0 = detector not needed, 1 = detect at min_interval."""
+        low, high = self.confidence_low, self.confidence_high
+        need_confidence = min(max((high - confidence) / (high - low), 0.0), 1.0)
+        need_speed = min(max(speed / self.speed_ref, 0.0), 1.0) if self.speed_ref > 0 else 0.0
+        return max(need_confidence, need_speed)
+
+    def should_detect(self, frame_seq=None, confidence=0.0, speed=0.0, queue_depth=0, queue_capacity=1,
+                      required=False, floor=None):
+        """
+        Called once per frame on which detections could be useful.
+
+        Args:
+            frame_seq: Sequence number of the frame, None to count calls instead.
+            confidence: Tracker confidence (0 when not tracking).
+            speed: Target speed in px/frame.
+            queue_depth: Frames currently queued on the NPU.
+            queue_capacity: Maximum frames the NPU queue accepts.
+            required: The tracker tracks on detector output, detect at min_interval.
+            floor: Lowest interval for this frame (e.g. re-acquisition duty cycle).
+        """
+        if not self.enabled:
+            self.requested += 1
+            return True
+
+        with self.lock:
+            self._calls += 1
+            if frame_seq is None:
+                frame_seq = self._calls
+            load = queue_depth / max(1, queue_capacity)
+            if required:
+                interval = self.min_interval
+            else:
+                span = self.max_interval - self.min_interval
+                interval = self.max_interval - self._need(confidence, speed) * span
+                interval = max(self.min_interval, int(math.ceil(interval * (1.0 + min(load, 1.0)))))
+            if floor is not None:
+                interval = max(interval, int(floor))
+            self.interval = interval
+
+            elapsed = None if self.last_seq is None else frame_seq - self.last_seq
+            if load >= 1.0:
+                self.backpressure += 1
+                run = False
+            elif elapsed is None or elapsed >= interval or elapsed < 0:
+                self.last_seq = frame_seq
+                self.requested += 1
+                run = True
+            else:
+                self.skipped += 1
+                run = False
+
+            self.duty_cycle += self.smoothing * (float(run) - self.duty_cycle)
+            return run
+
+    def get_stats(self):
+        return {
+            "enabled": self.enabled,
+            "interval": self.interval,
+            "duty_cycle": round(self.duty_cycle, 3),
+            "requested": self.requested,
+            "skipped": self.skipped,
+            "backpressure": self.backpressure,
+        }
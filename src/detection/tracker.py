@@ -13,6 +13,12 @@ import time
 import argparse
 from collections import deque
 
+try:
+    from src.detection.correlation import FFTMatcher, match_spatial, select_engine
+except ImportError:
+    # Running this file directly as the standalone demo
+    from correlation import FFTMatcher, match_spatial, select_engine
+
 try:
     from picamera2 import Picamera2
     PICAMERA2_AVAILABLE = True
@@ -20,6 +26,54 @@ except ImportError:
     PICAMERA2_AVAILABLE = False
 
 
+class FrameContext:
+    """
+    Per-frame cache of derived images shared by all tracker components.
+    Each conversion runs at most once per frame, on first use.
+    """
+    def __init__(self, frame):
+        self.frame = frame
+        self._gray = None
+        self._hsv = None
+        self._hsv_rois = 0
+        self._pyramid = {}
+    
+    @property
+    def gray(self):
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY) if len(self.frame.shape) == 3 else self.frame
+        return self._gray
+    
+    @property
+    def hsv(self):
+        """Full-frame HSV (None for grayscale input)"""
+        if self._hsv is None and len(self.frame.shape) == 3:
+            self._hsv = cv2.cvtColor(self.frame, cv2.COLOR_BGR2HSV)
+        return self._hsv
+    
+    def hsv_roi(self, x, y, w, h):
+        """
+        HSV of one box. A single validation only converts its ROI, once a
+        second ROI is requested the whole frame is converted and sliced.
+        """
+        if len(self.frame.shape) != 3:
+            return None
+        self._hsv_rois += 1
+        if self._hsv is None and self._hsv_rois < 2:
+            return cv2.cvtColor(self.frame[y:y+h, x:x+w], cv2.COLOR_BGR2HSV)
+        return self.hsv[y:y+h, x:x+w]
+    
+    def pyramid(self, level):
+        """Grayscale frame downsampled by 2**level (level 0 is the gray frame)"""
+        if level == 0:
+            return self.gray
+        img = self._pyramid.get(level)
+        if img is None:
+            img = cv2.pyrDown(self.pyramid(level - 1))
+            self._pyramid[level] = img
+        return img
+
+
 class FastSignature:
     """Lightweight signature for instant validation"""
     def __init__(self, frame, bbox):
@@ -52,10 +106,26 @@ class FastSignature:
             sw, sh = int(w*s), int(h*s)
             if sw >= 12 and sh >= 12:
                 self.scales[s] = cv2.resize(gray, (sw, sh))
+        self._pyramid_scales = {}
     
-    def quick_validate(self, frame, bbox):
+    def pyramid_scales(self, level):
+        """Search templates downsampled to a pyramid level (cached per level)"""
+        templates = self._pyramid_scales.get(level)
+        if templates is None:
+            templates = {}
+            f = 1 << level
+            for s, template in self.scales.items():
+                th, tw = template.shape
+                if tw // f >= 4 and th // f >= 4:
+                    templates[s] = cv2.resize(template, (tw // f, th // f), interpolation=cv2.INTER_AREA)
+            self._pyramid_scales[level] = templates
+        return templates
+    
+    def quick_validate(self, frame, bbox, ctx=None):
         """Ultra-fast validation - 1-2ms"""
         try:
+            if ctx is None:
+                ctx = FrameContext(frame)
             x, y, w, h = [int(v) for v in bbox]
             fh, fw = frame.shape[:2]
             
@@ -71,8 +141,7 @@ class FastSignature:
             if size_ratio < 0.3 or size_ratio > 4.0:
                 return 0.0
             
-            roi = frame[y:y+h, x:x+w]
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) if len(roi.shape) == 3 else roi
+            gray = ctx.gray[y:y+h, x:x+w]
             
             # Fast template match
             gray32 = cv2.resize(gray, (32, 32))
@@ -88,8 +157,8 @@ class FastSignature:
             hist_score = cv2.compareHist(self.hist, hist, cv2.HISTCMP_CORREL)
             
             # Color boost if available
-            if self.color_hist is not None and len(roi.shape) == 3:
-                hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+            if self.color_hist is not None and len(frame.shape) == 3:
+                hsv = ctx.hsv_roi(x, y, w, h)
                 chist = cv2.calcHist([hsv], [0, 1], None, [12, 8], [0, 180, 0, 256])
                 cv2.normalize(chist, chist)
                 color_score = cv2.compareHist(self.color_hist, chist, cv2.HISTCMP_CORREL)
@@ -124,9 +193,13 @@ class BBoxSmoother:
 
 class NanoTracker:
     """Lightning-fast NanoTrack implementation - 3x faster than CSRT"""
-    def __init__(self, frame, bbox):
+    def __init__(self, frame, bbox, match_engine="spatial", fft_min_area=4096):
         x, y, w, h = [int(v) for v in bbox]
         
+        # spatial, fft, or auto (fft from fft_min_area, see select_engine)
+        self.match_engine = select_engine(match_engine, w * h, fft_min_area)
+        self.fft = FFTMatcher() if self.match_engine == "fft" else None
+        
         # Extract template
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if len(frame.shape) == 3 else frame
         self.template = gray[y:y+h, x:x+w].copy()
@@ -142,10 +215,10 @@ class NanoTracker:
         self.last_box = bbox
         self.search_window_scale = 2.5  # Search window size multiplier
         
-    def update(self, frame):
+    def update(self, frame, ctx=None):
         """Ultra-fast template matching update"""
         try:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if len(frame.shape) == 3 else frame
+            gray = ctx.gray if ctx is not None else FrameContext(frame).gray
             fh, fw = gray.shape
             
             x, y, w, h = [int(v) for v in self.last_box]
@@ -168,14 +241,14 @@ class NanoTracker:
             best_loc = None
             best_scale = 1.0
             
-            for scale, template in self.templates.items():
-                th, tw = template.shape
-                
-                if tw >= search_region.shape[1] or th >= search_region.shape[0]:
-                    continue
-                
-                # Fast template matching
-                result = cv2.matchTemplate(search_region, template, cv2.TM_CCOEFF_NORMED)
+            rh, rw = search_region.shape
+            templates = {s: t for s, t in self.templates.items() if t.shape[1] < rw and t.shape[0] < rh}
+            if self.fft is not None:
+                results = self.fft.match(search_region, templates)
+            else:
+                results = match_spatial(search_region, templates)
+            
+            for scale, result in results.items():
                 min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
                 
                 if max_val > best_val:
@@ -209,13 +282,126 @@ class NanoTracker:
             return False, self.last_box
 
 
+class RecoverySearch:
+    """
+    Re-acquisition search spread over several frames.
+    The search region is split into tiles and each frame matches only as many
+    tiles as its time budget allows. The best candidate is kept until the
+    whole region is covered, then revalidated on the current frame.
+    """
+    def __init__(self, sig, tile_size=160, min_score=0.55):
+        self.sig = sig
+        self.tile_size = tile_size
+        self.min_score = min_score
+        self.reset()
+    
+    def reset(self):
+        self.tiles = []
+        self.next_tile = 0
+        self.best = None  # (score, scale, x, y)
+    
+    @property
+    def active(self):
+        return self.next_tile < len(self.tiles)
+    
+    @property
+    def coverage(self):
+        return self.next_tile / len(self.tiles) if self.tiles else 0.0
+    
+    def start(self, x1, y1, x2, y2):
+        self.reset()
+        for ty in range(y1, y2, self.tile_size):
+            for tx in range(x1, x2, self.tile_size):
+                self.tiles.append((tx, ty, min(tx + self.tile_size, x2), min(ty + self.tile_size, y2)))
+    
+    def step(self, frame, ctx, deadline):
+        """
+        Match tiles until the deadline (at least one per call).
+        Returns a validated box once the region is covered, else None.
+        """
+        if not self.sig.scales:
+            self.reset()
+            return None
+        
+        gray = ctx.gray
+        fh, fw = gray.shape
+        # Tiles overlap by the largest template so matches on tile edges are not lost
+        max_w = max(t.shape[1] for t in self.sig.scales.values())
+        max_h = max(t.shape[0] for t in self.sig.scales.values())
+        
+        processed = 0
+        while self.active and (processed == 0 or time.perf_counter() < deadline):
+            tx1, ty1, tx2, ty2 = self.tiles[self.next_tile]
+            self.next_tile += 1
+            processed += 1
+            
+            tile = gray[ty1:min(fh, ty2 + max_h - 1), tx1:min(fw, tx2 + max_w - 1)]
+            for scale, template in self.sig.scales.items():
+                th, tw = template.shape
+                if tw > tile.shape[1] or th > tile.shape[0]:
+                    continue
+                result = cv2.matchTemplate(tile, template, cv2.TM_CCOEFF_NORMED)
+                _, max_val, _, max_loc = cv2.minMaxLoc(result)
+                if max_val > self.min_score and (self.best is None or max_val > self.best[0]):
+                    self.best = (max_val, scale, tx1 + max_loc[0], ty1 + max_loc[1])
+        
+        if self.active:
+            return None
+        
+        found = self._revalidate(frame, ctx)
+        self.reset()
+        return found
+    
+    def _revalidate(self, frame, ctx):
+        if self.best is None:
+            return None
+        _, scale, x, y = self.best
+        template = self.sig.scales[scale]
+        th, tw = template.shape
+        
+        # The target may have moved while the region was being covered
+        gray = ctx.gray
+        fh, fw = gray.shape
+        m = max(tw, th) // 2
+        wx1, wy1 = max(0, x - m), max(0, y - m)
+        window = gray[wy1:min(fh, y + th + m), wx1:min(fw, x + tw + m)]
+        if window.shape[0] < th or window.shape[1] < tw:
+            return None
+        
+        result = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        if max_val <= self.min_score:
+            return None
+        
+        candidate = (wx1 + max_loc[0], wy1 + max_loc[1], tw, th)
+        if self.sig.quick_validate(frame, candidate, ctx) > self.min_score:
+            return candidate
+        return None
+
+
 class HybridTracker:
     """Optimized hybrid tracker with NanoTrack - instant response"""
-    def __init__(self, frame, bbox):
+    def __init__(self, frame, bbox, search_mode="full", pyramid_level=2, top_k=3, time_budget_ms=None, tile_size=160,
+                 match_engine="spatial", fft_min_area=4096, full_frame_search=True):
+        # Recovery search: "full" matches every scale at full resolution,
+        # "pyramid" matches on a downsampled level and refines the top_k
+        # candidates at full resolution, "incremental" spreads tiles of the
+        # search region over consecutive frames. The budget is checked
+        # between passes.
+        self.search_mode = search_mode
+        self.pyramid_level = pyramid_level
+        self.top_k = top_k
+        self.time_budget_ms = time_budget_ms
+        # Off when the detector proposes re-acquisition candidates instead
+        self.full_frame_search = full_frame_search
+        
         self.sig = FastSignature(frame, bbox)
+        self.recovery = RecoverySearch(self.sig, tile_size=tile_size)
         
         # NanoTrack - ultra-fast tracker (3x faster than CSRT)
-        self.tracker = NanoTracker(frame, bbox)
+        self.match_engine = match_engine
+        self.fft_min_area = fft_min_area
+        self.tracker = NanoTracker(frame, bbox, match_engine, fft_min_area)
         
         # Lightweight motion model
         x, y, w, h = [int(v) for v in bbox]
@@ -247,36 +433,63 @@ class HybridTracker:
         
         return self.last_box
     
-    def _fast_search(self, frame):
+    def _search_region(self, ctx):
+        """Search area around the predicted position, the whole frame after 50 lost frames"""
+        fh, fw = ctx.gray.shape
+        if self.lost_frames > 50 and self.full_frame_search:
+            return 0, 0, fw, fh
+        
+        pred_box = self._predict_position(min(self.lost_frames, 10))
+        px, py, pw, ph = [int(v) for v in pred_box]
+        
+        expand = max(pw, ph) * (2 if self.lost_frames < 20 else 4)
+        cx, cy = px + pw//2, py + ph//2
+        
+        x1 = max(0, int(cx - expand))
+        y1 = max(0, int(cy - expand))
+        x2 = min(fw, int(cx + expand))
+        y2 = min(fh, int(cy + expand))
+        return x1, y1, x2, y2
+    
+    def _deadline(self):
+        if self.time_budget_ms:
+            return time.perf_counter() + self.time_budget_ms / 1000.0
+        return float("inf")
+    
+    def _incremental_search(self, frame, ctx):
+        """Advance the tiled search by one frame's budget"""
+        try:
+            if not self.recovery.active:
+                self.recovery.start(*self._search_region(ctx))
+            return self.recovery.step(frame, ctx, self._deadline())
+        except:
+            self.recovery.reset()
+            return None
+    
+    def _fast_search(self, frame, ctx):
         """Lightning-fast template search"""
         try:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if len(frame.shape) == 3 else frame
-            fh, fw = gray.shape
+            gray = ctx.gray
             
             # Define smart search region
-            pred_box = self._predict_position(min(self.lost_frames, 10))
-            px, py, pw, ph = [int(v) for v in pred_box]
-            
-            expand = max(pw, ph) * (2 if self.lost_frames < 20 else 4)
-            cx, cy = px + pw//2, py + ph//2
-            
-            x1 = max(0, int(cx - expand))
-            y1 = max(0, int(cy - expand))
-            x2 = min(fw, int(cx + expand))
-            y2 = min(fh, int(cy + expand))
-            
-            if self.lost_frames > 50:
-                x1, y1, x2, y2 = 0, 0, fw, fh
+            x1, y1, x2, y2 = self._search_region(ctx)
             
             region = gray[y1:y2, x1:x2]
             if region.size == 0:
                 return None
             
+            deadline = self._deadline()
+            
+            if self.search_mode == "pyramid" and self.sig.pyramid_scales(self.pyramid_level):
+                return self._pyramid_search(frame, ctx, x1, y1, x2, y2, deadline)
+            
             # Try 3 scales only (fast)
             best_match = None
             best_score = 0.55
             
             for scale, template in self.sig.scales.items():
+                if time.perf_counter() > deadline:
+                    break
                 tw, th = template.shape[1], template.shape[0]
                 if tw >= region.shape[1] or th >= region.shape[0]:
                     continue
@@ -290,7 +503,7 @@ class HybridTracker:
                     candidate = (mx, my, tw, th)
                     
                     # Quick validation
-                    val_score = self.sig.quick_validate(frame, candidate)
+                    val_score = self.sig.quick_validate(frame, candidate, ctx)
                     if val_score > 0.55:
                         best_score = val_score
                         best_match = candidate
@@ -299,17 +512,86 @@ class HybridTracker:
         except:
             return None
     
-    def update(self, frame):
+    def _pyramid_search(self, frame, ctx, x1, y1, x2, y2, deadline):
+        """Coarse-to-fine search: find peaks on a pyramid level, refine the best at full resolution"""
+        f = 1 << self.pyramid_level
+        coarse = ctx.pyramid(self.pyramid_level)[y1 // f:y2 // f, x1 // f:x2 // f]
+        
+        candidates = []
+        for scale, template in self.sig.pyramid_scales(self.pyramid_level).items():
+            if time.perf_counter() > deadline:
+                break
+            th, tw = template.shape
+            if tw >= coarse.shape[1] or th >= coarse.shape[0]:
+                continue
+            
+            result = cv2.matchTemplate(coarse, template, cv2.TM_CCOEFF_NORMED)
+            for score, (mx, my) in self._top_peaks(result, self.top_k, tw, th):
+                candidates.append((score, scale, x1 + mx * f, y1 + my * f))
+        
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        
+        gray = ctx.gray
+        fh, fw = gray.shape
+        best_match = None
+        best_score = 0.55
+        
+        for _, scale, cx, cy in candidates[:self.top_k]:
+            if time.perf_counter() > deadline:
+                break
+            template = self.sig.scales[scale]
+            th, tw = template.shape
+            
+            # A coarse pixel covers f full-res pixels, search a couple of them around the peak
+            m = 2 * f
+            wx1, wy1 = max(0, cx - m), max(0, cy - m)
+            wx2, wy2 = min(fw, cx + tw + m), min(fh, cy + th + m)
+            window = gray[wy1:wy2, wx1:wx2]
+            if window.shape[0] < th or window.shape[1] < tw:
+                continue
+            
+            result = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            
+            if max_val > best_score:
+                candidate = (wx1 + max_loc[0], wy1 + max_loc[1], tw, th)
+                val_score = self.sig.quick_validate(frame, candidate, ctx)
+                if val_score > 0.55:
+                    best_score = val_score
+                    best_match = candidate
+        
+        return best_match
+    
+    @staticmethod
+    def _top_peaks(result, k, tw, th, min_score=0.3):
+        """Up to k local maxima of a match result, suppressing a template-sized area around each"""
+        peaks = []
+        for _ in range(k):
+            _, max_val, _, (mx, my) = cv2.minMaxLoc(result)
+            if max_val < min_score:
+                break
+            peaks.append((max_val, (mx, my)))
+            result[max(0, my - th // 2):my + th // 2 + 1, max(0, mx - tw // 2):mx + tw // 2 + 1] = -1.0
+        return peaks
+    
+    def update(self, frame, ctx=None):
         """Ultra-fast update - optimized path with NanoTrack"""
         self.frame_count += 1
+        # Gray/HSV/pyramid images shared by tracker, validation and search
+        if ctx is None:
+            ctx = FrameContext(frame)
         
         # Try tracker first (fastest path - NanoTrack is 3x faster than CSRT)
-        success, box = self.tracker.update(frame)
+        success, box = self.tracker.update(frame, ctx)
         
         if success:
+            # A tracker hit abandons any half-finished recovery search
+            if self.recovery.active:
+                self.recovery.reset()
+            
             # Quick validation every 3 frames (reduce overhead)
             if self.frame_count % 3 == 0:
-                conf = self.sig.quick_validate(frame, box)
+                conf = self.sig.quick_validate(frame, box, ctx)
                 self.confidence = conf
                 
                 if conf > 0.50:
@@ -344,37 +626,66 @@ class HybridTracker:
         # Tracker failed - increment lost counter
         self.lost_frames += 1
         
-        # Try fast search every 3 frames when lost
-        if self.lost_frames % 3 == 0 and self.lost_frames < 100:
-            found = self._fast_search(frame)
-            if found:
-                # Re-initialize tracker
-                self.tracker = NanoTracker(frame, found)
-                
-                x, y, w, h = [int(v) for v in found]
-                self.pos_history.clear()
-                self.pos_history.append([x + w//2, y + h//2])
-                self.velocity = np.array([0.0, 0.0])
-                
-                self.last_box = found
-                self.lost_frames = 0
-                self.confidence = 1.0
-                
-                # Smooth the recovery transition
-                smoothed_found = self.smoother.smooth(found)
-                return smoothed_found, "RECOV", 1.0
+        # Incremental search runs a budgeted slice every lost frame,
+        # the one-shot searches run every 3 frames
+        found = None
+        if self.lost_frames < 100:
+            if self.search_mode == "incremental":
+                found = self._incremental_search(frame, ctx)
+            elif self.lost_frames % 3 == 0:
+                found = self._fast_search(frame, ctx)
+        
+        if found:
+            return self._reseed(frame, found), "RECOV", 1.0
         
         # Return prediction while searching
         pred = self._predict_position(min(self.lost_frames, 20))
         return pred, "SEARCH", 0.0
+    
+    def _reseed(self, frame, found):
+        """Re-initialize tracker on a recovered box, returns the smoothed box"""
+        self.tracker = NanoTracker(frame, found, self.match_engine, self.fft_min_area)
+        
+        x, y, w, h = [int(v) for v in found]
+        self.pos_history.clear()
+        self.pos_history.append([x + w//2, y + h//2])
+        self.velocity = np.array([0.0, 0.0])
+        
+        self.last_box = found
+        self.lost_frames = 0
+        self.confidence = 1.0
+        self.recovery.reset()
+        
+        # Smooth the recovery transition
+        return self.smoother.smooth(found)
+    
+    def reacquire(self, frame, boxes, ctx=None, min_score=0.55):
+        """
+        Re-seed on the candidate box (e.g. from the detector) that best
+        matches the target signature. Returns the new box or None.
+        """
+        if ctx is None:
+            ctx = FrameContext(frame)
+        best, best_score = None, min_score
+        for box in boxes:
+            score = self.sig.quick_validate(frame, box, ctx)
+            if score > best_score:
+                best, best_score = box, score
+        if best is None:
+            return None
+        return self._reseed(frame, tuple(int(v) for v in best))
 
 
 class ObjectTracker:
     """
-    API Wrapper for the Ultra-Fast Hybrid Tracker.
+    API Wrapper around the tracker engines (src/detection/engines.py),
+    selected by tracking.tracker_type and switchable at runtime.
     Maintains compatibility with the rest of the codebase.
     """
     def __init__(self, detector=None):
+        from src.core.config import cfg
+        from src.detection.engines import EngineResources
+        
         self.detector = detector
         self.tracker = None
         self.tracking_active = False
@@ -382,11 +693,77 @@ class ObjectTracker:
         self.current_confidence = 0.0
         self.last_valid_bbox = None
         self.frames_since_lost = 0
-        self.tracker_type = "NANO"
         
-    def init(self, frame, bbox):
-        """Initialize tracker with a bounding box"""
-        self.tracker = HybridTracker(frame, bbox)
+        self.resources = EngineResources()
+        self._tracker_type = cfg.get("tracking.tracker_type", "NANO")
+        self._switch_pending = False
+        self.engine_stats = {}  # engine name -> StageStats of its update() cost
+        
+        # Detection-assisted re-acquisition while the target is lost
+        self.reacquire_enabled = bool(cfg.get("tracking.reacquire.enabled", True)) and \
+            detector is not None and getattr(detector, "enabled", False) and \
+            getattr(detector, "hailo_infer", None) is not None
+        self.reacquire_interval = max(1, int(cfg.get("tracking.reacquire.interval", 5)))
+        self.reacquire_size_band = float(cfg.get("tracking.reacquire.size_band", 2.0))
+        self.reacquire_min_score = float(cfg.get("tracking.reacquire.min_score", 0.55))
+        self.target_label = None
+        self.reacquisitions = 0
+        self._candidates = None  # (seq, detections) from the last detector result
+        self._candidates_seq = 0
+    
+    @property
+    def tracker_type(self):
+        return self._tracker_type
+    
+    @tracker_type.setter
+    def tracker_type(self, name):
+        from src.detection.engines import ENGINES
+        if name not in ENGINES:
+            raise ValueError(f"Unknown tracker engine: {name}. Must be one of {list(ENGINES)}")
+        if name != self._tracker_type:
+            self._tracker_type = name
+            # Rebuilt on the next frame at the last known box
+            self._switch_pending = self.tracking_active
+    
+    @property
+    def lost(self):
+        """True while a target is tracked but not currently found"""
+        return self.tracking_active and self.tracker is not None and self.frames_since_lost > 0
+    
+    @property
+    def tracks_on_detections(self):
+        """True if the active engine tracks on detector output (not only re-acquisition)"""
+        tracker = self.tracker
+        return self.tracking_active and tracker is not None and tracker.needs_detections
+    
+    @property
+    def target_speed(self):
+        """Target speed in px/frame from the engine's motion estimate, 0 if it has none"""
+        tracker = self.tracker
+        velocity = tracker.velocity if self.tracking_active and tracker is not None else None
+        if velocity is None:
+            return 0.0
+        return float(np.hypot(velocity[0], velocity[1]))
+    
+    def _create(self, frame, bbox):
+        from src.core.stages import StageStats
+        from src.detection.engines import create_engine
+        engine = create_engine(self._tracker_type, frame, bbox, self.resources)
+        self._tracker_type = engine.name
+        if engine.name not in self.engine_stats:
+            self.engine_stats[engine.name] = StageStats(engine.name)
+        return engine
+        
+    def init(self, frame, bbox, label=None):
+        """Initialize tracker with a bounding box, label is the detector class if known"""
+        self._switch_pending = False
+        self.target_label = label
+        self._candidates = None
+        # A target picked from a detection can be proposed by the detector again,
+        # so template search stays local. An ROI-selected target may be of a
+        # class the detector never reports and keeps the full-frame search.
+        self.resources.hybrid_options["full_frame_search"] = not (self.reacquire_enabled and label is not None)
+        self.tracker = self._create(frame, bbox)
         self.tracking_active = True
         self.status = "LOCK"
         self.current_confidence = 1.0
@@ -394,12 +771,25 @@ class ObjectTracker:
         self.frames_since_lost = 0
         return True
 
-    def update(self, frame):
+    def update(self, frame, ctx=None):
         """Update tracker with new frame"""
         if not self.tracking_active or self.tracker is None:
             return False, None
-            
-        box, status, confidence = self.tracker.update(frame)
+        
+        if self._switch_pending:
+            self._switch_pending = False
+            self.tracker = self._create(frame, self.last_valid_bbox)
+        
+        tracker = self.tracker
+        started = time.monotonic()
+        box, status, confidence = tracker.update(frame, ctx)
+        self.engine_stats[tracker.name].record(started)
+        
+        if status == "SEARCH" and self.reacquire_enabled:
+            found = self._reacquire(frame, ctx)
+            if found is not None:
+                box, status, confidence = found, "RECOV", 1.0
+        
         self.status = status
         self.current_confidence = confidence
         
@@ -414,14 +804,65 @@ class ObjectTracker:
             if self.frames_since_lost > 150: # 1.5s at 100fps
                 self.status = "LOST"
             return False, box
+    
+    def feed_detections(self, seq, detections):
+        """Passes detector output to engines that track on detections"""
+        tracker = self.tracker
+        if tracker is None:
+            return
+        if tracker.needs_detections:
+            tracker.feed_detections(seq, detections)
+        elif self.reacquire_enabled and self.frames_since_lost > 0:
+            self._candidates = (seq, detections)
+    
+    def _reacquire(self, frame, ctx):
+        """
+        Re-seeds the engine on the newest detector result: only boxes of the
+        target's class whose width and height are within reacquire_size_band
+        of the last known box are handed to the engine for validation.
+        """
+        candidates = self._candidates
+        if candidates is None or candidates[0] <= self._candidates_seq or self.last_valid_bbox is None:
+            return None
+        self._candidates_seq = candidates[0]
+        
+        _, _, w, h = self.last_valid_bbox
+        band = self.reacquire_size_band
+        boxes = [
+            bbox for label, _, bbox in candidates[1]
+            if (self.target_label is None or label == self.target_label)
+            and w / band <= bbox[2] <= w * band and h / band <= bbox[3] <= h * band
+        ]
+        if not boxes:
+            return None
+        
+        found = self.tracker.reacquire(frame, boxes, ctx, self.reacquire_min_score)
+        if found is not None:
+            self.reacquisitions += 1
+            self._candidates = None
+        return found
 
     def stop(self):
         """Stop tracking and reset state"""
         self.tracker = None
         self.tracking_active = False
+        self._switch_pending = False
         self.status = "IDLE"
         self.current_confidence = 0.0
         self.frames_since_lost = 0
+    
+    def get_stats(self):
+        """Active engine and per-engine update cost (busy_ms is time per frame)"""
+        from src.detection.engines import ENGINES
+        return {
+            "engine": self._tracker_type,
+            "available": list(ENGINES),
+            "status": self.status,
+            "confidence": round(float(self.current_confidence), 3),
+            "target_label": self.target_label,
+            "reacquisitions": self.reacquisitions,
+            "engines": {name: stats.snapshot() for name, stats in self.engine_stats.items()},
+        }
 
 
 class OptimizedCamera:
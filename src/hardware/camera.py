@@ -2,6 +2,8 @@ import cv2
 import threading
 import time
 from src.core.config import cfg
+from src.core.stages import StageStats
+from src.hardware.frame_buffer import FrameRing
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -10,6 +12,10 @@ class Camera:
     """
     Reads frames in a separate thread to ensure we always get the latest frame
     and prevent buffering/latency buildup.
+
+    Frames are captured straight into a preallocated FrameRing. Consumers
+    borrow() the newest frame as a read-only view tagged with a sequence
+    number and capture timestamp instead of copying it.
     """
     def __init__(self):
         self.running = False
@@ -17,10 +23,12 @@ class Camera:
         self.thread = None
         self.cap = None
         
-        self.frame = None
+        self.ring = FrameRing(cfg.get("camera.ring_slots", 6))
+        self.frame_shape = None
         self.ret = False
         
         self._connected = False
+        self.stats = StageStats("capture")
 
     def connect(self):
         url = cfg.get("camera.url")
@@ -66,15 +74,60 @@ class Camera:
 
     def _update(self):
         while self.running and self.cap.isOpened():
-            ret, frame = self.cap.read()
+            started = time.monotonic()
+            slot, buf = None, None
+            if self.frame_shape is not None:
+                slot, buf = self.ring.acquire(self.frame_shape)
+
+            # Decode straight into the free slot when the shape is known
+            ret, frame = self.cap.read(buf) if buf is not None else self.cap.read()
+            timestamp = time.monotonic()
             with self.lock:
                 self.ret = ret
-                self.frame = frame
-            time.sleep(0.001) # Low CPU usage yield
+            if not ret or frame is None:
+                time.sleep(0.01) # Stream hiccup, avoid spinning on failed reads
+                continue
+
+            if frame is not buf:
+                # First frame, resolution change or every slot borrowed
+                self.frame_shape = frame.shape
+                if buf is None or buf.shape != frame.shape:
+                    slot, buf = self.ring.acquire(frame.shape, frame.dtype)
+                    if slot is None:
+                        continue
+                buf[...] = frame
+
+            # cap.read() blocks until the next frame, waiters are woken by commit
+            self.ring.commit(slot, timestamp)
+            self.stats.record(started)
+
+    def borrow(self, after_seq=0):
+        """
+        Borrows the newest frame if it is newer than after_seq.
+        Returns a FrameRef (release it when done) or None.
+        """
+        return self.ring.borrow(after_seq)
+
+    def wait_for_frame(self, after_seq=0, timeout=None):
+        """
+        Blocks until a frame newer than after_seq has been captured.
+        Returns a borrowed FrameRef (release it when done) or None on timeout.
+        """
+        return self.ring.wait_borrow(after_seq, timeout)
+
+    @property
+    def latest_seq(self):
+        return self.ring.seq
 
     def read(self):
-        with self.lock:
-            return self.ret, self.frame.copy() if self.frame is not None else None
+        """Returns a private copy of the newest frame."""
+        if not self.ret:
+            return False, None
+        ref = self.ring.borrow()
+        if ref is None:
+            return self.ret, None
+        with ref:
+            return self.ret, ref.frame.copy()
 
     def stop(self):
         self.running = False
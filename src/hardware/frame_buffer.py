@@ -0,0 +1,142 @@
+import threading
+import numpy as np
+
+
+class FrameRef:
+    """
+    Borrowed, read-only view of one ring slot.
+    The slot is not overwritten until every reference has been released.
+    """
+    __slots__ = ("frame", "seq", "timestamp", "_ring", "_slot", "_gen")
+
+    def __init__(self, ring, slot, gen, frame, seq, timestamp):
+        self._ring = ring
+        self._slot = slot
+        self._gen = gen
+        self.frame = frame
+        self.seq = seq
+        self.timestamp = timestamp
+
+    def retain(self):
+        """Returns an extra reference to the same slot (for handing to another consumer)."""
+        return self._ring._retain(self)
+
+    def release(self):
+        if self._ring is not None:
+            self._ring._release(self._slot, self._gen)
+            self._ring = None
+            self.frame = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class FrameRing:
+    """
+    Preallocated ring of frame slots shared between the capture thread and
+    its consumers.
+
+    The producer fills a free slot in place (acquire -> commit), consumers
+    borrow the newest committed slot as a read-only view. Every committed
+    frame gets a monotonically increasing sequence number and a capture
+    timestamp, so consumers can skip frames they have already processed.
+    """
+    def __init__(self, num_slots=6):
+        self.num_slots = num_slots
+        self.lock = threading.Lock()
+        self.cond = threading.Condition(self.lock)
+        self._buffers = None
+        self._views = None
+        self._refs = [0] * num_slots
+        self._seqs = [0] * num_slots
+        self._stamps = [0.0] * num_slots
+        self._latest = -1
+        self._gen = 0
+        self.seq = 0
+        self.overruns = 0  # Frames dropped because every slot was borrowed
+
+    def _allocate(self, shape, dtype):
+        # Borrowed views keep their old arrays alive, so replacing is safe.
+        # Bumping the generation makes their late releases no-ops.
+        self._gen += 1
+        self._buffers = [np.empty(shape, dtype=dtype) for _ in range(self.num_slots)]
+        self._views = []
+        for buf in self._buffers:
+            view = buf.view()
+            view.flags.writeable = False
+            self._views.append(view)
+        self._refs = [0] * self.num_slots
+        self._seqs = [0] * self.num_slots
+        self._latest = -1
+
+    def acquire(self, shape, dtype=np.uint8):
+        """
+        Returns (slot, buffer) for the producer to write into, or (None, None)
+        if all slots are still borrowed.
+        """
+        with self.lock:
+            if self._buffers is None or self._buffers[0].shape != tuple(shape) or self._buffers[0].dtype != dtype:
+                self._allocate(shape, dtype)
+            for i in range(1, self.num_slots + 1):
+                slot = (self._latest + i) % self.num_slots
+                if slot != self._latest and self._refs[slot] == 0:
+                    return slot, self._buffers[slot]
+            self.overruns += 1
+            return None, None
+
+    def commit(self, slot, timestamp):
+        """Publishes a filled slot as the newest frame. Returns its sequence number."""
+        with self.lock:
+            self.seq += 1
+            self._seqs[slot] = self.seq
+            self._stamps[slot] = timestamp
+            self._latest = slot
+            self.cond.notify_all()
+            return self.seq
+
+    def borrow(self, after_seq=0):
+        """Borrows the newest frame if it is newer than after_seq, else returns None."""
+        with self.lock:
+            return self._borrow_locked(after_seq)
+
+    def wait_borrow(self, after_seq=0, timeout=None):
+        """
+        Blocks until a frame newer than after_seq is committed and borrows it.
+        Returns None on timeout.
+        """
+        with self.cond:
+            self.cond.wait_for(lambda: self._latest >= 0 and self._seqs[self._latest] > after_seq, timeout)
+            return self._borrow_locked(after_seq)
+
+    def _borrow_locked(self, after_seq):
+        slot = self._latest
+        if slot < 0 or self._seqs[slot] <= after_seq:
+            return None
+        self._refs[slot] += 1
+        return FrameRef(self, slot, self._gen, self._views[slot], self._seqs[slot], self._stamps[slot])
+
+    def _retain(self, ref):
+        with self.lock:
+            if ref._gen == self._gen:
+                self._refs[ref._slot] += 1
+            return FrameRef(self, ref._slot, ref._gen, ref.frame, ref.seq, ref.timestamp)
+
+    def _release(self, slot, gen):
+        with self.lock:
+            if gen == self._gen:
+                self._refs[slot] -= 1
+
+    @property
+    def latest_shape(self):
+        with self.lock:
+            if self._latest < 0:
+                return None
+            return self._buffers[self._latest].shape
+
+    @property
+    def borrowed(self):
+        with self.lock:
+            return sum(1 for r in self._refs if r > 0)
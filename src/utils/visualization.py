@@ -1,42 +1,107 @@
+from collections import OrderedDict
+
 import cv2
+import numpy as np
 
-def draw_detections(frame, detections):
-    """
-    Draw detection boxes.
-    detections: [(label, conf, (x,y,w,h)), ...]
-    """
-    for label, conf, (x, y, w, h) in detections:
-        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 165, 255), 2)
-        cv2.putText(frame, f"{label}: {conf:.2f}", (x, y - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 165, 255), 2)
 
-def draw_tracking_info(frame, bbox, center_x, center_y, error_x, error_y):
+class OverlayCompositor:
     """
-    Draw tracking box and error info.
+    Renders the stream overlays (tracking info or detections, HUD) onto an
+    output copy of the camera frame, resized to the output resolution
+    first so drawing happens at output size and the camera frame stays
+    clean for tracking.
+
+    Static labels (mode/version) are rendered once into cached coverage
+    masks keyed by string and style, and blended in afterwards. Text that
+    changes from frame to frame (FPS, tracking error, detection scores) would never hit
+    that cache, so it is drawn with cv2.putText directly.
     """
-    x, y, w, h = [int(v) for v in bbox]
-    target_x = x + w // 2
-    target_y = y + h // 2
-
-    # Box
-    cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
-    
-    # Center points
-    cv2.circle(frame, (target_x, target_y), 5, (0, 255, 0), -1)
-    cv2.circle(frame, (center_x, center_y), 5, (0, 0, 255), -1)
-    
-    # Line
-    cv2.line(frame, (center_x, center_y), (target_x, target_y), (255, 255, 0), 2)
-    
-    # Text
-    cv2.putText(frame, f"Err: {error_x},{error_y}", (10, 30), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-
-def draw_hud(frame, mode, fps, version="unknown", cpu=0):
-    # Bottom Left: Mode & Version
-    cv2.putText(frame, f"Mode: {mode.upper()} | v{version}", (10, frame.shape[0] - 20), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 2)
-    
-    # Bottom Right: FPS & CPU
-    cv2.putText(frame, f"FPS: {fps:.1f} | CPU: {cpu:.0f}%", (frame.shape[1] - 220, frame.shape[0] - 20), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 2)
+    FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+    def __init__(self, mode="debug", version="unknown", max_layers=8):
+        self.mode = mode
+        self.version = version
+        self.max_layers = max_layers
+        self._layers = OrderedDict()
+
+    def _layer(self, text, scale, thickness):
+        key = (text, scale, thickness)
+        layer = self._layers.get(key)
+        if layer is not None:
+            self._layers.move_to_end(key)
+            return layer
+        (w, h), baseline = cv2.getTextSize(text, self.FONT, scale, thickness)
+        pad = thickness + 1  # Room for antialiased edges
+        mask = np.zeros((h + baseline + 2 * pad, w + 2 * pad), dtype=np.uint8)
+        cv2.putText(mask, text, (pad, h + pad), self.FONT, scale, 255, thickness)
+        # Coverage (alpha) of the rendered text plus offset of its top left corner from the text origin
+        layer = (mask.astype(np.float32)[..., None] / 255.0, pad, h + pad)
+        self._layers[key] = layer
+        if len(self._layers) > self.max_layers:
+            self._layers.popitem(last=False)
+        return layer
+
+    def text(self, frame, text, org, scale, color, thickness):
+        """
+        Draws like cv2.putText(frame, text, org, FONT_HERSHEY_SIMPLEX, scale,
+        color, thickness), for labels that do not change per frame. The cached
+        coverage is blended like putText's antialiased edges; where strokes
+        overlap a pixel may differ from putText by one intensity level.
+        """
+        alpha, dx, dy = self._layer(text, scale, thickness)
+        x0, y0 = int(org[0]) - dx, int(org[1]) - dy
+        fh, fw = frame.shape[:2]
+        mh, mw = alpha.shape[:2]
+        cx0, cy0 = max(x0, 0), max(y0, 0)
+        cx1, cy1 = min(x0 + mw, fw), min(y0 + mh, fh)
+        if cx0 >= cx1 or cy0 >= cy1:
+            return
+        roi = frame[cy0:cy1, cx0:cx1]
+        a = alpha[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0]
+        blended = roi * (1.0 - a) + np.asarray(color, dtype=np.float32) * a
+        roi[...] = np.rint(blended)
+
+    def render(self, frame, size=None, track_info=None, detections=None, fps=0.0, cpu=0.0):
+        """
+        Returns the composed output frame.
+        size: output (width, height), None for the camera frame size.
+        track_info / detections are in camera frame coordinates.
+        """
+        h, w = frame.shape[:2]
+        if size is None or tuple(size) == (w, h):
+            out = frame.copy()
+            sx = sy = 1.0
+        else:
+            out = cv2.resize(frame, tuple(size), interpolation=cv2.INTER_AREA)
+            sx, sy = size[0] / w, size[1] / h
+
+        if track_info is not None:
+            self._tracking_info(out, sx, sy, *track_info)
+        elif detections:
+            self._detections(out, sx, sy, detections)
+        self._hud(out, fps, cpu)
+        return out
+
+    def _detections(self, frame, sx, sy, detections):
+        for label, conf, (x, y, w, h) in detections:
+            x, y, w, h = int(x * sx), int(y * sy), int(w * sx), int(h * sy)
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 165, 255), 2)
+            cv2.putText(frame, f"{label}: {conf:.2f}", (x, y - 10), self.FONT, 0.5, (0, 165, 255), 2)
+
+    def _tracking_info(self, frame, sx, sy, bbox, center_x, center_y, error_x, error_y):
+        x, y, w, h = [int(v) for v in bbox]
+        target = (int((x + w // 2) * sx), int((y + h // 2) * sy))
+        center = (int(center_x * sx), int(center_y * sy))
+        x, y, w, h = int(x * sx), int(y * sy), int(w * sx), int(h * sy)
+
+        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        cv2.circle(frame, target, 5, (0, 255, 0), -1)
+        cv2.circle(frame, center, 5, (0, 0, 255), -1)
+        cv2.line(frame, center, target, (255, 255, 0), 2)
+        # Error stays in camera pixels, as the gimbal controller sees it
+        cv2.putText(frame, f"Err: {error_x},{error_y}", (10, 30), self.FONT, 0.6, (0, 255, 255), 2)
+
+    def _hud(self, frame, fps, cpu):
+        fh, fw = frame.shape[:2]
+        self.text(frame, f"Mode: {self.mode.upper()} | v{self.version}", (10, fh - 20), 0.6, (200, 200, 200), 2)
+        cv2.putText(frame, f"FPS: {fps:.1f} | CPU: {cpu:.0f}%", (fw - 220, fh - 20), self.FONT, 0.6, (200, 200, 200), 2)
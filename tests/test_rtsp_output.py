@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.rtsp_output import RtspOutput
+
+
+class FakeWriter:
+    """Stands in for cv2.VideoWriter: opens or not, and dies after a number of writes like a failed pipeline."""
+
+    def __init__(self, opened=True, dies_after=None):
+        self.opened = opened
+        self.dies_after = dies_after
+        self.written = 0
+        self.released = False
+
+    def isOpened(self):
+        return self.opened
+
+    def write(self, frame):
+        # Like cv2.VideoWriter on GStreamer: never raises, the pipeline just goes away
+        self.written += 1
+        if self.dies_after is not None and self.written >= self.dies_after:
+            self.opened = False
+
+    def release(self):
+        self.released = True
+
+
+def make_output(writers, **kwargs):
+    """RtspOutput whose pipeline opens return the given writers in turn."""
+    writers = list(writers)
+    opened = []
+
+    def factory(pipeline, fps, size):
+        writer = writers.pop(0) if writers else FakeWriter()
+        opened.append(writer)
+        return writer
+
+    kwargs.setdefault("health_interval", 0)
+    output = RtspOutput("rtsp://127.0.0.1:8554/test", (64, 48), 1000, writer_factory=factory,
+                        restart_delay=1.0, max_restart_delay=4.0, poll_timeout=0.01, **kwargs)
+    delays = []
+
+    def wait_restart(delay):
+        delays.append(delay)
+        return output.running
+
+    output._wait_restart = wait_restart
+    return output, opened, delays
+
+
+def feed(output, until, timeout=2.0):
+    """Submits frames until until() holds, returns whether it did."""
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        output.submit(frame)
+        if until():
+            return True
+        time.sleep(0.002)
+    return False
+
+
+def test_silent_write_failure_restarts_pipeline():
+    output, opened, delays = make_output([FakeWriter(dies_after=3), FakeWriter()])
+    output.start()
+    try:
+        assert feed(output, lambda: len(opened) == 2 and opened[1].written > 0)
+    finally:
+        output.stop()
+    assert output.restarts == 1
+    assert opened[0].released
+    assert delays == [1.0]
+
+
+def test_restart_backoff_doubles_and_resets():
+    writers = [FakeWriter(opened=False), FakeWriter(opened=False), FakeWriter(opened=False),
+               FakeWriter(opened=False), FakeWriter(dies_after=1), FakeWriter(dies_after=1)]
+    output, opened, delays = make_output(writers)
+    output.start()
+    try:
+        assert feed(output, lambda: len(delays) >= 6)
+    finally:
+        output.stop()
+    # Four failed opens back off up to max_restart_delay
+    assert delays[:4] == [1.0, 2.0, 4.0, 4.0]
+    # A successful open does not reset the back-off until a frame is written,
+    # and the silent failure on the first write happens before that
+    assert delays[4:6] == [4.0, 4.0]
+
+
+def test_health_check_failure_restarts_and_backs_off():
+    checks = []
+
+    def health_check(url):
+        checks.append(url)
+        return len(checks) > 2
+
+    output, opened, delays = make_output([], health_interval=1e-6, health_check=health_check)
+    output.start()
+    try:
+        assert feed(output, lambda: len(checks) > 3)
+    finally:
+        output.stop()
+    assert output.restarts == 2
+    assert delays[:2] == [1.0, 2.0]
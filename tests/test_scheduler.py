@@ -0,0 +1,76 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.detection.scheduler import DetectionScheduler
+
+
+def run(scheduler, frames, **kwargs):
+    """Offers frames 1..frames, returns the sequence numbers sent to the detector."""
+    return [seq for seq in range(1, frames + 1) if scheduler.should_detect(frame_seq=seq, **kwargs)]
+
+
+def make():
+    return DetectionScheduler(min_interval=1, max_interval=10, confidence_low=0.4,
+                              confidence_high=0.8, speed_ref=20.0)
+
+
+def test_confident_slow_target_uses_max_interval():
+    scheduler = make()
+    sent = run(scheduler, 100, confidence=0.95, speed=1.0)
+    assert scheduler.interval == 10
+    assert sent == list(range(1, 101, 10))
+
+
+def test_unsure_target_uses_min_interval():
+    scheduler = make()
+    sent = run(scheduler, 20, confidence=0.3, speed=0.0)
+    assert scheduler.interval == 1
+    assert len(sent) == 20
+
+
+def test_fast_target_uses_min_interval():
+    scheduler = make()
+    run(scheduler, 20, confidence=0.95, speed=25.0)
+    assert scheduler.interval == 1
+
+
+def test_interval_grows_and_shrinks_with_confidence():
+    scheduler = make()
+    intervals = []
+    for confidence in (0.4, 0.5, 0.6, 0.7, 0.8):
+        scheduler.should_detect(frame_seq=len(intervals) + 1, confidence=confidence)
+        intervals.append(scheduler.interval)
+    assert intervals == sorted(intervals)
+    assert intervals[0] == 1 and intervals[-1] == 10
+
+    scheduler.should_detect(frame_seq=10, confidence=0.95, speed=12.0)
+    assert 1 < scheduler.interval < 10
+
+
+def test_elapsed_frames_counted_by_sequence_number():
+    # Offered only every 5th frame with an interval of 2: every offered frame is sent
+    scheduler = make()
+    sent = [seq for seq in range(1, 51, 5)
+            if scheduler.should_detect(frame_seq=seq, queue_depth=1, queue_capacity=2)]
+    assert scheduler.interval == 2
+    assert sent == list(range(1, 51, 5))
+
+
+def test_full_queue_holds_frames_back():
+    scheduler = make()
+    assert run(scheduler, 5, queue_depth=2, queue_capacity=2, required=True) == []
+    assert scheduler.backpressure == 5
+
+
+def test_required_ignores_confidence_and_load():
+    scheduler = make()
+    sent = run(scheduler, 10, confidence=0.95, queue_depth=1, queue_capacity=2, required=True)
+    assert len(sent) == 10
+
+
+def test_floor_limits_rate():
+    scheduler = make()
+    sent = run(scheduler, 20, confidence=0.0, floor=5)
+    assert sent == [1, 6, 11, 16]
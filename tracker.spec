@@ -29,9 +29,19 @@ a = Analysis(
         'requests',
         'src.core.config',
         'src.core.app',
+        'src.core.stages',
+        'src.core.rtsp_output',
+        'src.api.streaming',
         'src.hardware.camera',
+        'src.hardware.frame_buffer',
         'src.hardware.gimbal',
         'src.detection.detector',
+        'src.detection.preprocess',
+        'src.detection.correlation',
+        'src.detection.nanotrack_onnx',
+        'src.detection.engines',
+        'src.detection.scheduler',
+        'src.detection.bytetracker.byte_tracker',
         'src.detection.tracker',
         'src.utils.visualization',
         'src.utils.logger',